@@ -1,4 +1,5 @@
 import contextlib
+from typing import Any
 
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse, RedirectResponse
@@ -9,9 +10,11 @@ from sqlalchemy import select, true
 from src.app.api.endpoints.user import auth_user
 from src.app.core.config import settings
 from src.app.core.db import async_session_maker, get_async_session
+from src.app.crud.release import release_crud
 from src.app.models import Node
 from src.app.models.user import User, UserRolesEnum
 from src.app.schemas.user import UserLoginRequest
+from src.app.services.release import publish_release
 from src.app.services.user import get_current_user
 
 get_async_session_context = contextlib.asynccontextmanager(get_async_session)
@@ -36,6 +39,27 @@ async def node_exception_handler(
 class CustomAdmin(Admin):
     """Custom index view for Admin."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Register content publish route."""
+        super().__init__(*args, **kwargs)
+        self.admin.add_route(
+            '/publish', self.publish, methods=['POST'], name='publish',
+        )
+
+    @login_required
+    async def publish(self, request: Request) -> Response:
+        """Publish active content as a new release."""
+        user = await get_user_from_request(request=request)
+        async with async_session_maker() as session:
+            await publish_release(
+                session=session,
+                published_by=user.login if user else None,
+            )
+        return RedirectResponse(
+            request.url_for('admin:index'),
+            status_code=status.HTTP_303_SEE_OTHER,
+        )
+
     @login_required
     async def index(self, request: Request) -> Response:
         """Index view with nodes tree."""
@@ -43,6 +67,7 @@ class CustomAdmin(Admin):
             result = await session.execute(
                 select(Node).filter(Node.is_active == true()))
             nodes = result.scalars().all()
+            release = await release_crud.get_current(session=session)
             nodes_dict = {}
             for node in nodes:
                 nodes_dict[node.id] = {
@@ -65,7 +90,7 @@ class CustomAdmin(Admin):
             return await self.templates.TemplateResponse(
                 request,
                 "sqladmin/index.html",
-                context={"tree": root_nodes})
+                context={"tree": root_nodes, "release": release})
 
 
 async def get_user_from_request(request: Request) -> User | None:
@@ -28,12 +28,47 @@ from src.app.admin.validators import (
     check_unique_image_order,
     node_has_children,
 )
+from src.app.core.config import settings
 from src.app.core.const import DATE_TIME_FORMAT, MESSAGE_REPR_LEN
+from src.app.crud.image import image_crud
 from src.app.crud.node import node_crud
+from src.app.crud.release import release_crud
 from src.app.models.content import Button, Image, Node
 from src.app.models.hr_request import HRRequest, HRRequestStatusEnum
 from src.app.models.user import User, UserRolesEnum
-from src.app.services.telegram import send_telegram_message
+from src.app.schemas.content import ImageFileId
+from src.app.services.auth_revocation import auth_revocations
+from src.app.services.cache import node_cache
+from src.app.services.telegram import send_telegram_message, upload_photo
+
+
+class ContentCacheMixin:
+    """Сброс кеша узлов после изменений контента в админке.
+
+    После первой публикации бэкенд отдаёт только релиз, и правки в админке
+    видны лишь после следующей публикации, поэтому кеш не сбрасывается.
+    """
+
+    async def invalidate_unpublished(self) -> None:
+        """Invalidate node cache if live nodes are served."""
+        async with self.session_maker() as session:
+            release_id = await release_crud.get_current_id(session=session)
+        if release_id is None:
+            node_cache.invalidate()
+
+    async def after_model_change(
+        self,
+        data: dict[str, Any],
+        model: Any,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        """Invalidate node cache after save."""
+        await self.invalidate_unpublished()
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        """Invalidate node cache after delete."""
+        await self.invalidate_unpublished()
 
 
 class UserAdmin(ModelView, model=User):
@@ -131,9 +166,28 @@ class UserAdmin(ModelView, model=User):
         check_role_and_handle_password(
             data, is_created, old_role, new_role, password,
         )
+        # Права прежнего Telegram ID тоже нужно перепроверить в боте.
+        request.state.old_telegram_id = model.telegram_id
+
+    async def after_model_change(
+        self,
+        data: dict,
+        model: User,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        """Revoke cached bot access of changed user."""
+        auth_revocations.revoke(
+            model.telegram_id,
+            getattr(request.state, 'old_telegram_id', None),
+        )
 
+    async def after_model_delete(self, model: User, request: Request) -> None:
+        """Revoke cached bot access of deleted user."""
+        auth_revocations.revoke(model.telegram_id)
 
-class NodeAdmin(ModelView, model=Node):
+
+class NodeAdmin(ContentCacheMixin, ModelView, model=Node):
     """Node admin class."""
 
     name = 'узел'
@@ -210,7 +264,7 @@ class NodeAdmin(ModelView, model=Node):
         return await super().delete_model(request, pk)
 
 
-class ButtonAdmin(ModelView, model=Button):
+class ButtonAdmin(ContentCacheMixin, ModelView, model=Button):
     """Button admin class."""
 
     name = 'кнопку'
@@ -282,7 +336,7 @@ class ButtonAdmin(ModelView, model=Button):
             )
 
 
-class ImageAdmin(ModelView, model=Image):
+class ImageAdmin(ContentCacheMixin, ModelView, model=Image):
     """Image admin class."""
 
     can_edit = False
@@ -360,6 +414,28 @@ class ImageAdmin(ModelView, model=Image):
                 exclude_id=exclude_id,
             )
 
+    async def after_model_change(
+        self,
+        data: dict[str, Any],
+        model: Image,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        """Pre-upload new image to Telegram to get its file_id."""
+        await super().after_model_change(data, model, is_created, request)
+        if not (is_created and settings.IMAGE_WARMUP_CHAT_ID):
+            return
+        file_id = await upload_photo(
+            settings.IMAGE_WARMUP_CHAT_ID, str(model.image_url),
+        )
+        if file_id:
+            async with self.session_maker() as session:
+                await image_crud.set_file_ids(
+                    items=[ImageFileId(image_id=model.id, file_id=file_id)],
+                    session=session,
+                )
+            await self.invalidate_unpublished()
+
 
 class HRRequestAdmin(ModelView, model=HRRequest):
     """HRRequest admin class."""
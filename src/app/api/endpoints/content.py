@@ -1,40 +1,172 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.api.responses import JSONBytesResponse
+from src.app.core.const import (
+    CONTENT_CHANGES_MAX_TIMEOUT,
+    NODE_BATCH_MAX_SIZE,
+    NODE_PREFETCH_MAX_DEPTH,
+    NODE_SEARCH_LIMIT,
+    NODE_SEARCH_MAX_LEN,
+    NODE_SEARCH_MAX_LIMIT,
+    NODE_SEARCH_MIN_LEN,
+)
 from src.app.core.db import get_async_session
-from src.app.crud.node import node_crud
-from src.app.schemas.content import NodeResponse
-from src.app.services.node import enrich_node
+from src.app.crud.image import image_crud
+from src.app.schemas.content import (
+    ContentChangesResponse,
+    ContentGraphResponse,
+    ContentVersionResponse,
+    ImageFileId,
+    NodeCacheStats,
+    NodeResponse,
+    NodeSearchResponse,
+    NodeSubtreeResponse,
+)
+from src.app.services.cache import node_cache
+from src.app.services.content_change import get_content_changes
+from src.app.services.node import (
+    get_conditional_node_json,
+    get_content_graph_json,
+    get_nodes_json,
+    search_nodes_json,
+)
+from src.app.services.telegram import verify_bot_token
 
 router = APIRouter()
 
 
-@router.get('/nodes/root', response_model=NodeResponse)
+async def conditional_node_response(
+    node_id: int | None,
+    session: AsyncSession,
+    request: Request,
+    depth: int = 0,
+) -> Response:
+    """Answer 304 for unchanged node or return its JSON with ETag."""
+    content, etag = await get_conditional_node_json(
+        node_id, session, request, depth,
+    )
+    if content is None:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag},
+        )
+    return JSONBytesResponse(content, headers={'ETag': etag})
+
+
+@router.get(
+    '/nodes',
+    response_model=list[NodeResponse],
+    response_class=JSONBytesResponse,
+)
+async def get_nodes_view(
+    ids: list[int] = Query(..., max_length=NODE_BATCH_MAX_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+    request: Request = None,
+) -> Response:
+    """Batch nodes router."""
+    return JSONBytesResponse(await get_nodes_json(ids, session, request))
+
+
+@router.get(
+    '/nodes/root',
+    response_model=NodeResponse,
+    response_class=JSONBytesResponse,
+)
 async def get_root_node_view(
     session: AsyncSession = Depends(get_async_session),
     request: Request = None,
-) -> NodeResponse:
+) -> Response:
     """Root node router."""
-    node = await node_crud.get_root(session=session)
-    if not node:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Node not found',
-        )
-    return await enrich_node(node, session, request)
+    return await conditional_node_response(None, session, request)
+
+
+@router.get('/nodes/cache/stats', response_model=NodeCacheStats)
+async def get_node_cache_stats() -> NodeCacheStats:
+    """Node cache counters router."""
+    return NodeCacheStats(**node_cache.stats())
+
+
+@router.get(
+    '/nodes/graph',
+    response_model=ContentGraphResponse,
+    response_class=JSONBytesResponse,
+)
+async def get_content_graph_view(
+    session: AsyncSession = Depends(get_async_session),
+    request: Request = None,
+) -> Response:
+    """Content graph snapshot router."""
+    return JSONBytesResponse(await get_content_graph_json(session, request))
+
 
+@router.get('/nodes/graph/version', response_model=ContentVersionResponse)
+async def get_content_version_view() -> ContentVersionResponse:
+    """Content version router."""
+    return ContentVersionResponse(version=node_cache.version)
 
-@router.get('/nodes/{id}', response_model=NodeResponse)
+
+@router.get('/nodes/changes', response_model=ContentChangesResponse)
+async def get_content_changes_view(
+    since: int | None = Query(None, ge=0),
+    wait_seconds: float = Query(
+        0, alias='timeout', ge=0, le=CONTENT_CHANGES_MAX_TIMEOUT,
+    ),
+    session: AsyncSession = Depends(get_async_session),
+) -> ContentChangesResponse:
+    """Content change feed router with optional long polling."""
+    return await get_content_changes(since, wait_seconds, session)
+
+
+@router.get(
+    '/nodes/search',
+    response_model=list[NodeSearchResponse],
+    response_class=JSONBytesResponse,
+)
+async def search_nodes_view(
+    q: str = Query(
+        ..., min_length=NODE_SEARCH_MIN_LEN, max_length=NODE_SEARCH_MAX_LEN,
+    ),
+    limit: int = Query(NODE_SEARCH_LIMIT, ge=1, le=NODE_SEARCH_MAX_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Full-text node search router."""
+    return JSONBytesResponse(await search_nodes_json(q, limit, session))
+
+
+@router.put(
+    '/images/file-ids',
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(verify_bot_token)],
+)
+async def set_image_file_ids_view(
+    items: list[ImageFileId] = Body(..., max_length=NODE_BATCH_MAX_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+) -> None:
+    """Save Telegram file_id of images sent by bot."""
+    await image_crud.set_file_ids(items=items, session=session)
+
+
+@router.get(
+    '/nodes/{id}',
+    response_model=NodeSubtreeResponse,
+    response_class=JSONBytesResponse,
+)
 async def get_node_view(
     node_id: int = Path(..., alias='id'),
+    depth: int = Query(0, ge=0, le=NODE_PREFETCH_MAX_DEPTH),
     session: AsyncSession = Depends(get_async_session),
     request: Request = None,
-) -> NodeResponse:
+) -> Response:
     """Node router."""
-    node = await node_crud.get_by_id(node_id=node_id, session=session)
-    if not node:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Node not found',
-        )
-    return await enrich_node(node, session, request)
+    return await conditional_node_response(
+        node_id, session, request, depth,
+    )
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.api.responses import JSONBytesResponse
 from src.app.core.db import get_async_session
 from src.app.crud.hr_request import hr_request_crud
 from src.app.crud.user import user_crud
-from src.app.models.hr_request import HRRequest
-from src.app.schemas.hr_request import HRRequestCreate, HRRequestGet
+from src.app.schemas.hr_request import (
+    HRRequestCreate,
+    HRRequestGet,
+    hr_request_list_adapter,
+)
 from src.app.services.telegram import send_telegram_message
 
 router = APIRouter()
@@ -32,13 +36,17 @@ async def create_hr_request(
     await send_telegram_message(user.telegram_id, text)
 
 
-@router.get('/hr-requests', response_model=list[HRRequestGet])
+@router.get(
+    '/hr-requests',
+    response_model=list[HRRequestGet],
+    response_class=JSONBytesResponse,
+)
 async def get_user_hr_requests(
     telegram_id: int,
     offset: int = 0,
     limit: int = 5,
     session: AsyncSession = Depends(get_async_session),
-) -> list[HRRequest]:
+) -> Response:
     """Get user HRRequest objects by Telegram ID."""
     user = await user_crud.get_by_telegram_id(
         telegram_id=telegram_id, session=session,
@@ -48,6 +56,11 @@ async def get_user_hr_requests(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='User not found or inactive.',
         )
-    return await hr_request_crud.get_user_requests(
+    hr_requests = await hr_request_crud.get_user_requests(
         user_id=user.id, session=session, offset=offset, limit=limit,
     )
+    return JSONBytesResponse(hr_request_list_adapter.dump_json(
+        hr_request_list_adapter.validate_python(
+            hr_requests, from_attributes=True,
+        ),
+    ))
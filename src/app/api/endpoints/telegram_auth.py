@@ -1,26 +1,72 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.api.responses import JSONBytesResponse
+from src.app.core.const import AUTH_REVOCATIONS_MAX_TIMEOUT
 from src.app.core.db import get_async_session
 from src.app.crud.user import user_crud
 from src.app.schemas.telegram_auth import (
+    AuthRevocationsResponse,
+    SessionBootstrapResponse,
     TelegramAuthRequest,
     TelegramAuthResponse,
 )
+from src.app.services.auth_revocation import auth_revocations
+from src.app.services.node import get_node_json
 
 router = APIRouter()
 
 
-@router.post('/auth/telegram', response_model=TelegramAuthResponse)
+@router.post(
+    '/auth/telegram',
+    response_model=TelegramAuthResponse,
+    response_class=JSONBytesResponse,
+)
 async def auth_telegram_user(
     data: TelegramAuthRequest,
     session: AsyncSession = Depends(get_async_session),
-) -> TelegramAuthResponse:
+) -> Response:
     """Telegram auth router."""
     user = await user_crud.get_by_telegram_id(
         telegram_id=data.telegram_id, session=session,
     )
-    return TelegramAuthResponse(
+    return JSONBytesResponse(TelegramAuthResponse(
         allowed=bool(user),
         role=user.role if user else None,
+    ).model_dump_json())
+
+
+@router.post(
+    '/auth/telegram/session',
+    response_model=SessionBootstrapResponse,
+    response_class=JSONBytesResponse,
+)
+async def bootstrap_telegram_session(
+    data: TelegramAuthRequest,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request = None,
+) -> Response:
+    """Telegram session router: auth decision with root node."""
+    user = await user_crud.get_by_telegram_id(
+        telegram_id=data.telegram_id, session=session,
     )
+    auth = TelegramAuthResponse(
+        allowed=bool(user),
+        role=user.role if user else None,
+    ).model_dump_json().encode()
+    root = b'null'
+    if user:
+        root = await get_node_json(None, session, request)
+    # Корневой узел уже сериализован в кеше, дописываем готовые байты.
+    return JSONBytesResponse(auth[:-1] + b',"root":' + root + b'}')
+
+
+@router.get('/auth/revocations', response_model=AuthRevocationsResponse)
+async def get_auth_revocations(
+    since: int | None = Query(None, ge=0),
+    wait_seconds: float = Query(
+        0, alias='timeout', ge=0, le=AUTH_REVOCATIONS_MAX_TIMEOUT,
+    ),
+) -> AuthRevocationsResponse:
+    """Revoked Telegram auth router with optional long polling."""
+    return await auth_revocations.wait_since(since, wait_seconds)
@@ -0,0 +1,12 @@
+from starlette.responses import Response
+
+
+class JSONBytesResponse(Response):
+    """JSON response with body serialized beforehand.
+
+    Endpoint returns bytes prepared by prebuilt pydantic ``TypeAdapter``,
+    so FastAPI neither validates it against ``response_model`` a second
+    time nor encodes it with ``json.dumps``.
+    """
+
+    media_type = 'application/json'
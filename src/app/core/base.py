@@ -1,2 +1,11 @@
 from src.app.core.db import DATABASE_URL, Base  # noqa
-from src.app.models import Button, Image, Node, User # noqa
+from src.app.models import ( # noqa
+    Button,
+    ContentChange,
+    ContentRelease,
+    CurrentRelease,
+    Image,
+    Node,
+    ReleaseNode,
+    User,
+)
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
 
     BOT_TOKEN: str
+    # Токен бота для служебных запросов к API (например, сохранение file_id).
+    BOT_API_TOKEN: str | None = None
+    # Чат, куда загружаются новые изображения, чтобы получить их file_id.
+    IMAGE_WARMUP_CHAT_ID: int | None = None
+    # Адрес бэкенда для полных URL изображений. Без него берётся адрес
+    # запроса, и каждый новый заголовок Host занимает свои записи кеша.
+    MEDIA_BASE_URL: str | None = None
 
     app_title: str = 'HR Bot API'
     secret: str
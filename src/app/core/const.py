@@ -1,7 +1,13 @@
+from datetime import timedelta
+
 # Auth
 MIN_PASSWORD_LEN = 4
 JWT_LIFETIME = 7200
 
+# Bot auth cache revocations
+AUTH_REVOCATIONS_LIMIT = 1000
+AUTH_REVOCATIONS_MAX_TIMEOUT = 60
+
 # Admin
 DATE_TIME_FORMAT = '%Y-%m-%d %H:%M'
 GALLERY_IMAGE_NUM = 10
@@ -11,3 +17,32 @@ TEXT_IMAGE_NUM = 1
 # Hr_request params
 HR_REQUEST_OFFSET = 0
 HR_REQUEST_LIMIT = 5
+
+# Content cache
+NODE_CACHE_TTL = 300
+NODE_CACHE_SIZE = 10_000
+NODE_PREFETCH_MAX_DEPTH = 3
+NODE_BATCH_MAX_SIZE = 100
+
+# Content change feed
+CONTENT_CHANGES_LIMIT = 500
+CONTENT_CHANGES_MAX_TIMEOUT = 60
+CONTENT_CHANGES_POLL_INTERVAL = 5
+CONTENT_CHANGES_KEEP = timedelta(days=7)
+CONTENT_CHANGES_PRUNE_INTERVAL = 60 * 60
+# node_id отметки об удалённых по сроку записях, настоящих узлов с ним нет.
+CONTENT_CHANGES_PRUNED = 0
+
+# Content releases
+CURRENT_RELEASE_ID = 1
+CONTENT_RELEASES_KEEP = 10
+
+# Content search
+NODE_SEARCH_CONFIG = 'russian'
+NODE_SEARCH_MIN_LEN = 2
+NODE_SEARCH_MAX_LEN = 200
+NODE_SEARCH_LIMIT = 5
+NODE_SEARCH_MAX_LIMIT = 20
+
+# Responses
+GZIP_MIN_SIZE = 1024
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -6,8 +7,10 @@ from sqlalchemy import select
 from sqlalchemy.exc import MultipleResultsFound
 
 from src.app.core.config import settings
+from src.app.core.const import CONTENT_CHANGES_PRUNE_INTERVAL
 from src.app.core.db import async_session_maker
 from src.app.models import Node, NodeLayoutTypeEnum, User, UserRolesEnum
+from src.app.services.content_change import prune_content_changes
 from src.app.services.user import get_password_hash
 
 
@@ -48,4 +51,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             )
             session.add(admin_user)
             await session.commit()
+    pruning = asyncio.create_task(
+        prune_content_changes(CONTENT_CHANGES_PRUNE_INTERVAL),
+    )
     yield
+    pruning.cancel()
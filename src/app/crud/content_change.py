@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from sqlalchemy import BigInteger, Text, cast, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.const import CONTENT_CHANGES_LIMIT, CONTENT_CHANGES_PRUNED
+from src.app.models.content import ContentChange
+from src.app.models.release import ContentRelease
+
+# Транзакции с номером меньше горизонта завершены, новые записи в журнале
+# могут появиться только с номером не меньше него.
+TXID_HORIZON = cast(
+    cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger,
+)
+
+
+class ContentChangeCRUD:
+    """Custom ContentChange CRUDs."""
+
+    async def get_horizon(self, session: AsyncSession) -> int:
+        """Get txid below which all transactions have finished."""
+        result = await session.execute(select(TXID_HORIZON))
+        return result.scalar_one()
+
+    async def get_pruned_txid(self, session: AsyncSession) -> int:
+        """Get txid of the latest change removed by retention or 0."""
+        result = await session.execute(
+            select(func.coalesce(func.max(ContentChange.txid), 0))
+            .where(ContentChange.node_id == CONTENT_CHANGES_PRUNED),
+        )
+        return result.scalar_one()
+
+    async def get_since(
+        self,
+        since: int,
+        horizon: int,
+        session: AsyncSession,
+        limit: int = CONTENT_CHANGES_LIMIT,
+        published_only: bool = False,
+    ) -> tuple[list[ContentChange], int]:
+        """Get changes of transactions from since up to horizon.
+
+        Returns changes and the next cursor. Changes of one transaction
+        are never split between pages. With published_only only changes
+        made by publishing releases are returned.
+        """
+        stmt = (
+            select(ContentChange)
+            .where(
+                ContentChange.txid >= since,
+                ContentChange.txid < horizon,
+                ContentChange.node_id != CONTENT_CHANGES_PRUNED,
+            )
+            .order_by(ContentChange.txid, ContentChange.id)
+        )
+        if published_only:
+            stmt = stmt.where(
+                ContentChange.table_name == ContentRelease.__tablename__,
+            )
+        result = await session.execute(stmt.limit(limit))
+        changes = result.scalars().all()
+        if len(changes) < limit:
+            return changes, horizon
+        last = changes[-1]
+        result = await session.execute(stmt.where(
+            ContentChange.txid == last.txid, ContentChange.id > last.id,
+        ))
+        return changes + result.scalars().all(), last.txid + 1
+
+    async def prune(
+        self, keep: timedelta, session: AsyncSession,
+    ) -> None:
+        """Delete changes older than keep and remember the latest of them."""
+        deleted = (
+            delete(ContentChange)
+            .where(ContentChange.changed_at < func.now() - keep)
+            .returning(ContentChange.txid)
+            .cte('deleted')
+        )
+        result = await session.execute(select(func.max(deleted.c.txid)))
+        pruned = result.scalar_one()
+        if pruned is None:
+            return
+        # Отметка показывает ленте, что курсоры до неё устарели.
+        await session.execute(insert(ContentChange).values(
+            table_name=ContentChange.__tablename__,
+            operation='PRUNE',
+            row_id=0,
+            node_id=CONTENT_CHANGES_PRUNED,
+            txid=pruned,
+        ))
+
+
+content_change_crud = ContentChangeCRUD()
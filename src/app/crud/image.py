@@ -0,0 +1,54 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.const import CURRENT_RELEASE_ID
+from src.app.models.content import Image
+from src.app.models.release import CurrentRelease, ReleaseNode
+from src.app.schemas.content import ImageFileId
+
+
+class ImageCRUD:
+    """Custom Image CRUDs."""
+
+    async def set_file_ids(
+        self, items: list[ImageFileId], session: AsyncSession,
+    ) -> None:
+        """Save Telegram file_id of images and of current release."""
+        if not items:
+            return
+        file_ids = {item.image_id: item.file_id for item in items}
+        await session.execute(
+            update(Image),
+            [
+                {'id': image_id, 'telegram_file_id': file_id}
+                for image_id, file_id in file_ids.items()
+            ],
+        )
+        # Бот получает узлы текущего релиза, собранные при публикации,
+        # поэтому file_id дописываем и в них: иначе до следующей публикации
+        # картинки загружались бы в Telegram заново.
+        result = await session.execute(
+            select(ReleaseNode.id, ReleaseNode.payload)
+            .join(
+                CurrentRelease,
+                CurrentRelease.release_id == ReleaseNode.release_id,
+            )
+            .where(
+                CurrentRelease.id == CURRENT_RELEASE_ID,
+                ReleaseNode.node_id.in_(
+                    select(Image.node_id).where(Image.id.in_(file_ids)),
+                ),
+            ),
+        )
+        patched = []
+        for release_node_id, payload in result.all():
+            for image in payload['images']:
+                if image['id'] in file_ids:
+                    image['file_id'] = file_ids[image['id']]
+            patched.append({'id': release_node_id, 'payload': payload})
+        if patched:
+            await session.execute(update(ReleaseNode), patched)
+        await session.commit()
+
+
+image_crud = ImageCRUD()
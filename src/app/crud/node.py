@@ -1,7 +1,117 @@
-from sqlalchemy import select
+from sqlalchemy import (
+    JSON,
+    Row,
+    Select,
+    Text,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import TSQUERY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from src.app.models.content import Node
+from src.app.core.const import NODE_SEARCH_CONFIG
+from src.app.models.content import Button, Image, Node
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json", type_=JSON)
+
+
+def _json_list(*columns: object, order_by: object) -> object:
+    """Собрать строки подзапроса в упорядоченный JSON-массив."""
+    fields = []
+    for column in columns:
+        fields.extend((column.key, column))
+    return func.coalesce(
+        func.json_agg(
+            aggregate_order_by(func.json_build_object(*fields), order_by),
+            type_=JSON,
+        ),
+        EMPTY_JSON_ARRAY,
+    )
+
+
+def hydrated_node_select(with_children: bool = True) -> Select:
+    """Select node with buttons, images and children in one statement."""
+    child = aliased(Node)
+    buttons = (
+        select(_json_list(
+            Button.id,
+            Button.label,
+            Button.target_node_id,
+            Button.order,
+            order_by=Button.order,
+        ))
+        .where(Button.source_node_id == Node.id, Button.is_active)
+        .scalar_subquery()
+    )
+    images = (
+        select(_json_list(
+            Image.id,
+            Image.image_url,
+            Image.order,
+            Image.telegram_file_id.label('file_id'),
+            order_by=Image.order,
+        ))
+        .where(Image.node_id == Node.id)
+        .scalar_subquery()
+    )
+    children = (
+        select(_json_list(
+            child.id,
+            child.title,
+            child.text,
+            child.layout_type,
+            child.parent_id,
+            order_by=child.id,
+        ))
+        .where(child.parent_id == Node.id, child.is_active)
+        .scalar_subquery()
+    )
+    columns = [Node, buttons.label('buttons'), images.label('images')]
+    if with_children:
+        columns.append(children.label('children'))
+    return select(*columns)
+
+
+def reachable_ids_select(node_id: int, depth: int) -> Select:
+    """Select ids of nodes reachable by buttons or children within depth."""
+    edges = union_all(
+        select(
+            Button.source_node_id.label('source_id'),
+            Button.target_node_id.label('target_id'),
+        ).where(Button.is_active),
+        select(Node.parent_id, Node.id).where(Node.parent_id.is_not(None)),
+    ).subquery('edges')
+    target = aliased(Node)
+    reachable = select(
+        literal(node_id).label('id'), literal(0).label('depth'),
+    ).cte('reachable', recursive=True)
+    # Скрытые узлы недоступны пользователю: через них обход не идёт.
+    reachable = reachable.union(
+        select(edges.c.target_id, reachable.c.depth + 1)
+        .join(reachable, edges.c.source_id == reachable.c.id)
+        .join(target, target.id == edges.c.target_id)
+        .where(reachable.c.depth < depth, target.is_active),
+    )
+    return select(reachable.c.id)
+
+
+def search_query(query: str) -> object:
+    """Build full-text query matching any of the words."""
+    # Слова запроса объединяем через ИЛИ: узлы с большим числом
+    # совпадений всё равно окажутся выше за счёт ранга.
+    return cast(
+        func.replace(
+            cast(func.plainto_tsquery(NODE_SEARCH_CONFIG, query), Text),
+            '&',
+            '|',
+        ),
+        TSQUERY,
+    )
 
 
 class NodeCRUD:
@@ -23,5 +133,69 @@ class NodeCRUD:
         )
         return result.scalar_one_or_none()
 
+    async def get_hydrated_by_id(
+        self, node_id: int, session: AsyncSession,
+    ) -> Row | None:
+        """Get node with its relations by ID."""
+        result = await session.execute(
+            hydrated_node_select().where(Node.id == node_id),
+        )
+        return result.one_or_none()
+
+    async def get_hydrated_root(self, session: AsyncSession) -> Row | None:
+        """Get root node with its relations."""
+        result = await session.execute(
+            hydrated_node_select().where(Node.parent_id.is_(None)),
+        )
+        return result.one_or_none()
+
+    async def get_hydrated_many(
+        self, node_ids: list[int], session: AsyncSession,
+    ) -> list[Row]:
+        """Get active nodes with their relations by IDs."""
+        result = await session.execute(
+            hydrated_node_select().where(
+                Node.id.in_(node_ids), Node.is_active,
+            ),
+        )
+        return result.all()
+
+    async def get_hydrated_subtree(
+        self, node_id: int, depth: int, session: AsyncSession,
+    ) -> list[Row]:
+        """Get active node and nodes reachable from it within depth."""
+        result = await session.execute(
+            hydrated_node_select().where(
+                Node.id.in_(reachable_ids_select(node_id, depth)),
+                Node.is_active,
+            ),
+        )
+        return result.all()
+
+    async def get_hydrated_active(
+        self, session: AsyncSession, with_children: bool = False,
+    ) -> list[Row]:
+        """Get all active nodes with buttons and images."""
+        result = await session.execute(
+            hydrated_node_select(with_children=with_children)
+            .where(Node.is_active)
+            .order_by(Node.id),
+        )
+        return result.all()
+
+    async def search(
+        self, query: str, limit: int, session: AsyncSession,
+    ) -> list[Row]:
+        """Search active nodes by title and text ranked by relevance."""
+        ts_query = search_query(query)
+        rank = func.ts_rank(Node.search_vector, ts_query)
+        result = await session.execute(
+            select(Node.id, Node.title, rank.label('rank'))
+            .where(Node.search_vector.bool_op('@@')(ts_query), Node.is_active)
+            .order_by(rank.desc(), Node.id)
+            .limit(limit),
+        )
+        return result.all()
+
 
 node_crud = NodeCRUD()
@@ -0,0 +1,166 @@
+from sqlalchemy import Row, and_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.const import CONTENT_RELEASES_KEEP, CURRENT_RELEASE_ID
+from src.app.crud.node import search_query
+from src.app.models.release import ContentRelease, CurrentRelease, ReleaseNode
+
+
+class ReleaseCRUD:
+    """Custom ContentRelease CRUDs."""
+
+    async def get_current(
+        self, session: AsyncSession,
+    ) -> ContentRelease | None:
+        """Get current release."""
+        result = await session.execute(
+            select(ContentRelease)
+            .join(
+                CurrentRelease, CurrentRelease.release_id == ContentRelease.id,
+            )
+            .where(CurrentRelease.id == CURRENT_RELEASE_ID),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_current_id(self, session: AsyncSession) -> int | None:
+        """Get current release ID."""
+        result = await session.execute(
+            select(CurrentRelease.release_id)
+            .where(CurrentRelease.id == CURRENT_RELEASE_ID),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_payload(
+        self, release_id: int, node_id: int | None, session: AsyncSession,
+    ) -> dict | None:
+        """Get node payload from release (None — root node)."""
+        stmt = select(ReleaseNode.payload).where(
+            ReleaseNode.release_id == release_id,
+        )
+        if node_id is None:
+            stmt = stmt.join(
+                ContentRelease, ContentRelease.id == ReleaseNode.release_id,
+            ).where(ReleaseNode.node_id == ContentRelease.root_id)
+        else:
+            stmt = stmt.where(ReleaseNode.node_id == node_id)
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_many(
+        self, node_ids: list[int], session: AsyncSession,
+    ) -> list[Row]:
+        """Get node payloads from current release by IDs.
+
+        Returns empty list if nothing is published.
+        """
+        result = await session.execute(
+            select(CurrentRelease.release_id, ReleaseNode.payload)
+            .outerjoin(ReleaseNode, and_(
+                ReleaseNode.release_id == CurrentRelease.release_id,
+                ReleaseNode.node_id.in_(node_ids),
+            ))
+            .where(CurrentRelease.id == CURRENT_RELEASE_ID),
+        )
+        return result.all()
+
+    async def get_subtree(
+        self,
+        release_id: int,
+        node_id: int,
+        depth: int,
+        session: AsyncSession,
+    ) -> list[dict]:
+        """Get payloads of node and nodes reachable from it within depth."""
+        reachable = select(
+            literal(node_id).label('id'), literal(0).label('depth'),
+        ).cte('reachable', recursive=True)
+        reachable = reachable.union(
+            select(func.unnest(ReleaseNode.edges), reachable.c.depth + 1)
+            .join(reachable, ReleaseNode.node_id == reachable.c.id)
+            .where(
+                ReleaseNode.release_id == release_id,
+                reachable.c.depth < depth,
+            ),
+        )
+        result = await session.execute(
+            select(ReleaseNode.payload).where(
+                ReleaseNode.release_id == release_id,
+                ReleaseNode.node_id.in_(select(reachable.c.id)),
+            ),
+        )
+        return result.scalars().all()
+
+    async def get_all(
+        self, release_id: int, session: AsyncSession,
+    ) -> list[dict]:
+        """Get payloads of all nodes in release."""
+        result = await session.execute(
+            select(ReleaseNode.payload)
+            .where(ReleaseNode.release_id == release_id)
+            .order_by(ReleaseNode.node_id),
+        )
+        return result.scalars().all()
+
+    async def get_payloads(
+        self, release_id: int, session: AsyncSession,
+    ) -> dict[int, dict]:
+        """Get payloads of release nodes by node ID."""
+        result = await session.execute(
+            select(ReleaseNode.node_id, ReleaseNode.payload)
+            .where(ReleaseNode.release_id == release_id),
+        )
+        return dict(result.all())
+
+    async def search(
+        self,
+        release_id: int,
+        query: str,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[Row]:
+        """Search release nodes by published title and text."""
+        ts_query = search_query(query)
+        rank = func.ts_rank(ReleaseNode.search_vector, ts_query)
+        result = await session.execute(
+            select(
+                ReleaseNode.node_id.label('id'),
+                ReleaseNode.payload['title'].astext.label('title'),
+                rank.label('rank'),
+            )
+            .where(
+                ReleaseNode.release_id == release_id,
+                ReleaseNode.search_vector.bool_op('@@')(ts_query),
+            )
+            .order_by(rank.desc(), ReleaseNode.node_id)
+            .limit(limit),
+        )
+        return result.all()
+
+    async def set_current(
+        self, release_id: int, session: AsyncSession,
+    ) -> None:
+        """Point current release to given one."""
+        stmt = insert(CurrentRelease).values(
+            id=CURRENT_RELEASE_ID, release_id=release_id,
+        )
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[CurrentRelease.id],
+            set_={'release_id': stmt.excluded.release_id},
+        ))
+
+    async def remove_old(
+        self, session: AsyncSession, keep: int = CONTENT_RELEASES_KEEP,
+    ) -> None:
+        """Delete all releases except the latest ones."""
+        latest = (
+            select(ContentRelease.id)
+            .order_by(ContentRelease.id.desc())
+            .limit(keep)
+        )
+        await session.execute(
+            delete(ContentRelease).where(ContentRelease.id.not_in(latest)),
+        )
+
+
+release_crud = ReleaseCRUD()
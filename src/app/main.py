@@ -2,6 +2,7 @@ from pathlib import Path
 
 import nest_asyncio
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -20,12 +21,14 @@ from src.app.admin.views import (
 )
 from src.app.api.routers import v1_router
 from src.app.core.config import settings
+from src.app.core.const import GZIP_MIN_SIZE
 from src.app.core.db import engine
 from src.app.core.init_db import lifespan
 
 nest_asyncio.apply()
 
 app = FastAPI(title=settings.app_title, lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 
 app.mount('/static', StaticFiles(directory='src/app/static'), name='static')
 app.mount('/media', StaticFiles(directory='node_images'), name='media')
@@ -1,3 +1,10 @@
-from .content import Button, Image, Node, NodeLayoutTypeEnum # noqa
+from .content import ( # noqa
+    Button,
+    ContentChange,
+    Image,
+    Node,
+    NodeLayoutTypeEnum,
+)
 from .hr_request import HRRequest, HRRequestStatusEnum # noqa
+from .release import ContentRelease, CurrentRelease, ReleaseNode # noqa
 from .user import User, UserRolesEnum # noqa
\ No newline at end of file
@@ -3,18 +3,25 @@ from typing import Any
 
 from fastapi_storages.integrations.sqlalchemy import FileType
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
+    DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     event,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ENUM as PGENUM
-from sqlalchemy.orm import relationship, sessionmaker, validates
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship, sessionmaker, validates
 
 from src.app.core.db import Base, image_storage
 
@@ -62,6 +69,15 @@ class Node(Base):
     )
     is_active = Column(
         Boolean, default=True, nullable=False, server_default='True')
+    # Поисковый вектор: совпадения в названии весят больше, чем в тексте.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(text, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     # Изображения, связанные с этим узлом.
     images = relationship(
@@ -70,6 +86,12 @@ class Node(Base):
         cascade='all, delete-orphan',
     )
 
+    __table_args__ = (
+        Index(
+            'ix_node_search_vector', 'search_vector', postgresql_using='gin',
+        ),
+    )
+
     @validates('parent_id')
     def validate_parent_id_not_self(
         self, key: str, value: int | None,
@@ -173,6 +195,8 @@ class Image(Base):
     image_url = Column(FileType(storage=image_storage))
     file_name = Column(String, nullable=False, index=True)
     order = Column(Integer, nullable=False)
+    # file_id загруженного в Telegram файла, чтобы не скачивать его снова.
+    telegram_file_id = Column(String, nullable=True)
 
     @property
     def image_preview(self) -> str:
@@ -199,3 +223,34 @@ class Image(Base):
 
     def __repr__(self) -> str:
         return str(self)
+
+
+class ContentChange(Base):
+    """Запись журнала изменений узлов, кнопок и изображений.
+
+    Заполняется триггерами БД: на каждое изменение строки пишется по записи
+    на каждый затронутый узел (для узла — он сам и его родители).
+    txid — номер транзакции, записавшей изменение: по нему лента отдаёт
+    только записи завершённых транзакций и не пропускает те, что
+    зафиксировались позже записей с большим id.
+    """
+
+    table_name = Column(String, nullable=False)
+    operation = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    node_id = Column(Integer, nullable=False, index=True)
+    changed_at = Column(
+        DateTime, nullable=False, server_default=func.now(),
+    )
+    txid = Column(
+        BigInteger,
+        nullable=False,
+        index=True,
+        server_default=text('pg_current_xact_id()::text::bigint'),
+    )
+
+    def __str__(self) -> str:
+        return f'{self.operation} {self.table_name} #{self.row_id}'
+
+    def __repr__(self) -> str:
+        return str(self)
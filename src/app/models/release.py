@@ -0,0 +1,91 @@
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+
+from src.app.core.db import Base
+
+
+class ContentRelease(Base):
+    """Опубликованная неизменяемая версия контента."""
+
+    root_id = Column(Integer, nullable=True)
+    nodes_count = Column(Integer, nullable=False)
+    published_by = Column(String, nullable=True)
+    published_at = Column(
+        DateTime, nullable=False, server_default=func.now(),
+    )
+
+    nodes = relationship(
+        'ReleaseNode',
+        back_populates='release',
+        cascade='all, delete-orphan',
+        passive_deletes=True,
+    )
+
+    def __str__(self) -> str:
+        return f'Релиз #{self.id}'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class ReleaseNode(Base):
+    """Готовый ответ узла в опубликованной версии контента."""
+
+    release_id = Column(
+        Integer,
+        ForeignKey('contentrelease.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    node_id = Column(Integer, nullable=False)
+    # Узлы, куда ведут кнопки и потомки, — для предзагрузки на глубину.
+    edges = Column(ARRAY(Integer), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    # Поиск идёт по опубликованным названию и тексту, как и у Node.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', "
+            "coalesce(payload ->> 'title', '')), 'A') || "
+            "setweight(to_tsvector('russian', "
+            "coalesce(payload ->> 'text', '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    release = relationship('ContentRelease', back_populates='nodes')
+
+    __table_args__ = (
+        UniqueConstraint(
+            'release_id', 'node_id', name='uq_releasenode_release_node',
+        ),
+        Index(
+            'ix_releasenode_search_vector',
+            'search_vector',
+            postgresql_using='gin',
+        ),
+    )
+
+    def __str__(self) -> str:
+        return f'Узел #{self.node_id} релиза #{self.release_id}'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class CurrentRelease(Base):
+    """Указатель на текущий релиз, публикация переключает его атомарно."""
+
+    release_id = Column(
+        Integer, ForeignKey('contentrelease.id'), nullable=False,
+    )
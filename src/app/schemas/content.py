@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from src.app.models.content import NodeLayoutTypeEnum
 
@@ -10,10 +10,7 @@ class ContentBase(BaseModel):
 
     id: int
 
-    class Config:
-        """Поддержка ORM."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ButtonResponse(ContentBase):
@@ -29,6 +26,7 @@ class ImageResponse(ContentBase):
 
     image_url: str
     order: int
+    file_id: Optional[str] = None
 
 
 class ChildNodeResponse(ContentBase):
@@ -46,3 +44,77 @@ class NodeResponse(ChildNodeResponse):
     children: List[ChildNodeResponse]
     buttons: List[ButtonResponse]
     images: List[ImageResponse]
+
+
+class NodeSubtreeResponse(NodeResponse):
+    """Node full response with prefetched reachable nodes."""
+
+    prefetched: List[NodeResponse] = []
+
+
+class GraphNodeResponse(ChildNodeResponse):
+    """Node of content graph snapshot."""
+
+    buttons: List[ButtonResponse]
+    images: List[ImageResponse]
+
+
+class ContentGraphResponse(BaseModel):
+    """Content graph snapshot."""
+
+    version: int
+    nodes: List[GraphNodeResponse]
+
+
+class ContentVersionResponse(BaseModel):
+    """Content version."""
+
+    version: int
+
+
+class NodeSearchResponse(ContentBase):
+    """Node search match."""
+
+    title: str
+    rank: float
+
+
+class ImageFileId(BaseModel):
+    """Telegram file_id of uploaded image."""
+
+    image_id: int
+    file_id: str
+
+
+class ContentChangeResponse(ContentBase):
+    """Content change log entry."""
+
+    table_name: str
+    operation: str
+    row_id: int
+    node_id: int
+
+
+class ContentChangesResponse(BaseModel):
+    """Content changes since cursor."""
+
+    cursor: int
+    content_version: int
+    changes: List[ContentChangeResponse]
+    reset: bool = False
+
+
+class NodeCacheStats(BaseModel):
+    """Node cache counters."""
+
+    version: int
+    size: int
+    locks: int
+    hits: int
+    misses: int
+
+
+node_adapter = TypeAdapter(NodeResponse)
+node_subtree_adapter = TypeAdapter(NodeSubtreeResponse)
+content_graph_adapter = TypeAdapter(ContentGraphResponse)
+node_search_adapter = TypeAdapter(List[NodeSearchResponse])
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from src.app.models.hr_request import HRRequestStatusEnum
 
@@ -23,7 +23,7 @@ class HRRequestGet(BaseModel):
     hr_reply: Optional[str] = None
     replied_at: Optional[datetime] = None
 
-    class Config:
-        """Поддержка ORM."""
+    model_config = ConfigDict(from_attributes=True)
 
-        orm_mode = True
+
+hr_request_list_adapter = TypeAdapter(list[HRRequestGet])
@@ -1,6 +1,9 @@
+from typing import List
+
 from pydantic import BaseModel
 
 from src.app.models.user import UserRolesEnum
+from src.app.schemas.content import NodeResponse
 
 
 class TelegramAuthRequest(BaseModel):
@@ -14,3 +17,17 @@ class TelegramAuthResponse(BaseModel):
 
     allowed: bool
     role: UserRolesEnum | None = None
+
+
+class SessionBootstrapResponse(TelegramAuthResponse):
+    """Telegram session bootstrap response."""
+
+    root: NodeResponse | None = None
+
+
+class AuthRevocationsResponse(BaseModel):
+    """Telegram IDs whose access changed since cursor."""
+
+    cursor: int
+    reset: bool = False
+    telegram_ids: List[int] = []
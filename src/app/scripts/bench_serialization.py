@@ -0,0 +1,109 @@
+"""Micro-benchmark of node response serialization.
+
+Compares the regular FastAPI path (model -> response_model validation ->
+jsonable_encoder -> json.dumps) with the prebuilt TypeAdapter path used by
+the bot-facing endpoints, for a node with 20 buttons and 10 images.
+
+Run: python -m src.app.scripts.bench_serialization
+"""
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.app.models.content import NodeLayoutTypeEnum
+from src.app.schemas.content import (
+    ButtonResponse,
+    ChildNodeResponse,
+    ImageResponse,
+    NodeResponse,
+    NodeSubtreeResponse,
+    node_adapter,
+)
+
+BUTTONS_NUM = 20
+IMAGES_NUM = 10
+CHILDREN_NUM = 5
+ROUNDS = 5000
+
+
+def build_node() -> NodeResponse:
+    """Build node response like enrich_node does."""
+    return NodeResponse(
+        id=1,
+        title='Отпуск',
+        text='Как оформить ежегодный оплачиваемый отпуск. ' * 10,
+        layout_type=NodeLayoutTypeEnum.gallery,
+        parent_id=None,
+        children=[
+            ChildNodeResponse(
+                id=100 + i,
+                title=f'Раздел {i}',
+                text='Текст раздела',
+                layout_type=NodeLayoutTypeEnum.text,
+                parent_id=1,
+            )
+            for i in range(CHILDREN_NUM)
+        ],
+        buttons=[
+            ButtonResponse(
+                id=i, label=f'Кнопка {i}', target_node_id=200 + i, order=i,
+            )
+            for i in range(BUTTONS_NUM)
+        ],
+        images=[
+            ImageResponse(
+                id=i,
+                image_url=f'https://example.com/media/image_{i}.png',
+                order=i,
+            )
+            for i in range(IMAGES_NUM)
+        ],
+    )
+
+
+response_field = create_model_field(
+    name='Response_get_node_view', type_=NodeSubtreeResponse,
+    mode='serialization',
+)
+
+
+async def fastapi_path() -> bytes:
+    """Serialize as FastAPI does for a response_model endpoint."""
+    content = await serialize_response(
+        field=response_field, response_content=build_node(),
+    )
+    return JSONResponse(content).body
+
+
+async def adapter_path() -> bytes:
+    """Serialize with prebuilt TypeAdapter straight to bytes."""
+    return node_adapter.dump_json(build_node())
+
+
+async def measure(func: Callable[[], Awaitable[bytes]]) -> float:
+    """Return best time per call in microseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return best / ROUNDS * 1e6
+
+
+async def main() -> None:
+    """Run benchmark and print per-request CPU time."""
+    results = {}
+    for name, func in (('fastapi', fastapi_path), ('adapter', adapter_path)):
+        results[name] = await measure(func)
+        print(f'{name:>8}: {results[name]:8.1f} us/request')
+    saved = results['fastapi'] - results['adapter']
+    print(f'   saved: {saved:8.1f} us/request')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from collections import deque
+
+from src.app.core.const import AUTH_REVOCATIONS_LIMIT
+from src.app.schemas.telegram_auth import AuthRevocationsResponse
+
+
+class AuthRevocationLog:
+    """Журнал Telegram ID, у которых изменились права, в памяти процесса.
+
+    Бот кеширует решение об авторизации и по этому журналу сбрасывает
+    записи пользователей, изменённых в админке. Если курсор бота не
+    совпадает с журналом (рестарт бэкенда или записи вытеснены), в ответе
+    выставляется reset, и бот сбрасывает весь кеш.
+    """
+
+    def __init__(self, max_size: int = AUTH_REVOCATIONS_LIMIT) -> None:
+        """Initialize empty log."""
+        # Курсор от времени старта, чтобы после рестарта он не повторялся.
+        self.cursor = time.time_ns() // 1_000_000
+        self._entries: deque[tuple[int, int]] = deque(maxlen=max_size)
+        self._changed = asyncio.Event()
+
+    def revoke(self, *telegram_ids: int | None) -> None:
+        """Record Telegram IDs whose access must be rechecked."""
+        recorded = False
+        for telegram_id in dict.fromkeys(telegram_ids):
+            if telegram_id is None:
+                continue
+            self.cursor += 1
+            self._entries.append((self.cursor, telegram_id))
+            recorded = True
+        if recorded:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    def get_since(self, since: int | None) -> AuthRevocationsResponse:
+        """Return Telegram IDs revoked after cursor."""
+        if since is None:
+            return AuthRevocationsResponse(cursor=self.cursor)
+        oldest = self._entries[0][0] - 1 if self._entries else self.cursor
+        if not oldest <= since <= self.cursor:
+            return AuthRevocationsResponse(cursor=self.cursor, reset=True)
+        return AuthRevocationsResponse(
+            cursor=self.cursor,
+            telegram_ids=list(dict.fromkeys(
+                telegram_id
+                for cursor, telegram_id in self._entries if cursor > since
+            )),
+        )
+
+    async def wait_since(
+        self, since: int | None, wait_seconds: float,
+    ) -> AuthRevocationsResponse:
+        """Return revocations after cursor, waiting for them if none yet."""
+        if since is not None and since == self.cursor:
+            try:
+                await asyncio.wait_for(self._changed.wait(), wait_seconds)
+            except TimeoutError:
+                pass
+        return self.get_since(since)
+
+
+auth_revocations = AuthRevocationLog()
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from src.app.core.const import NODE_CACHE_SIZE, NODE_CACHE_TTL
+
+
+class KeyLock:
+    """Блокировка сборки одного ключа с числом ожидающих."""
+
+    def __init__(self) -> None:
+        """Initialize free lock."""
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class NodeCache:
+    """Кеш собранных ответов узлов в памяти процесса.
+
+    Записи привязаны к глобальной версии контента: любое изменение узлов,
+    кнопок или изображений в админке увеличивает версию, и все записи
+    становятся недействительными. Пересборка одного ключа выполняется
+    под отдельной блокировкой, поэтому после сброса кеша параллельные
+    запросы к одному узлу ждут первую сборку, а не идут в БД. Записей не
+    больше max_size, первыми вытесняются давно не читанные; блокировка
+    ключа живёт, пока его кто-то собирает или ждёт.
+    """
+
+    def __init__(
+        self, ttl: float = NODE_CACHE_TTL, max_size: int = NODE_CACHE_SIZE,
+    ) -> None:
+        """Initialize empty cache."""
+        self.ttl = ttl
+        self.max_size = max_size
+        # Версия от времени старта, чтобы после рестарта она не повторялась.
+        self.version = time.time_ns() // 1_000_000
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[int, float, Any]] = (
+            OrderedDict()
+        )
+        self._locks: dict[Hashable, KeyLock] = {}
+        self._changed = asyncio.Event()
+
+    def invalidate(self) -> None:
+        """Bump content version and drop all entries."""
+        self.version += 1
+        self._entries.clear()
+        # Будим всех, кто ждёт изменений, и готовим событие для следующих.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, wait_seconds: float) -> bool:
+        """Wait until content version changes or time is out."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), wait_seconds)
+        except TimeoutError:
+            return False
+        return True
+
+    def _lookup(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, expires_at, value = entry
+        if version != self.version or expires_at < time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return cached value of current version or None."""
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, version: int) -> None:
+        """Store value built for given content version."""
+        # Не сохраняем результат, если контент изменился во время сборки.
+        if version == self.version:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get_or_build(
+        self, key: Hashable, build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return cached value or build it once for all waiters."""
+        value = self._lookup(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        key_lock = self._locks.get(key)
+        if key_lock is None:
+            key_lock = self._locks[key] = KeyLock()
+        key_lock.pending += 1
+        try:
+            async with key_lock.lock:
+                value = self.get(key)
+                if value is not None:
+                    return value
+                version = self.version
+                value = await build()
+                self.put(key, value, version)
+                return value
+        finally:
+            # Ключи вроде несуществующих ID не должны копить блокировки.
+            key_lock.pending -= 1
+            if not key_lock.pending:
+                del self._locks[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {
+            'version': self.version,
+            'size': len(self._entries),
+            'locks': len(self._locks),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+node_cache = NodeCache()
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.const import (
+    CONTENT_CHANGES_KEEP,
+    CONTENT_CHANGES_POLL_INTERVAL,
+)
+from src.app.core.db import async_session_maker
+from src.app.crud.content_change import content_change_crud
+from src.app.schemas.content import (
+    ContentChangeResponse,
+    ContentChangesResponse,
+)
+from src.app.services.cache import node_cache
+from src.app.services.node import get_current_release_id
+
+
+async def get_content_changes(
+    since: int | None, wait_seconds: float, session: AsyncSession,
+) -> ContentChangesResponse:
+    """Вернуть изменения после since, при их отсутствии ждать wait_seconds.
+
+    Курсор — номер транзакции: изменения всех транзакций с номером меньше
+    курсора уже отданы. Отдаются только завершённые транзакции, поэтому
+    запись, зафиксированная позже соседних, не пропадает. Без since
+    возвращается только текущий курсор. Если записи после курсора уже
+    удалены по сроку хранения, в ответе выставляется reset. Изменения из
+    админки будят ожидание сразу, записи в БД в обход админки
+    подхватываются периодическим опросом.
+    """
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        content_version = node_cache.version
+        horizon = await content_change_crud.get_horizon(session=session)
+        reset = (
+            since is not None and
+            since <= await content_change_crud.get_pruned_txid(
+                session=session,
+            )
+        )
+        if since is None or reset:
+            cursor = horizon
+            changes = []
+        else:
+            # После первой публикации бот видит только релизы, правки
+            # черновиков из триггеров его кеши не затрагивают.
+            release_id = await get_current_release_id(session)
+            rows, cursor = await content_change_crud.get_since(
+                since=since,
+                horizon=horizon,
+                session=session,
+                published_only=release_id is not None,
+            )
+            changes = [
+                ContentChangeResponse.model_validate(change)
+                for change in rows
+            ]
+        # Не держим соединение из пула, пока ждём изменений.
+        await session.rollback()
+        remaining = deadline - time.monotonic()
+        if since is None or reset or changes or remaining <= 0:
+            break
+        await node_cache.wait_for_change(
+            min(remaining, CONTENT_CHANGES_POLL_INTERVAL),
+        )
+    return ContentChangesResponse(
+        cursor=cursor,
+        content_version=content_version,
+        changes=changes,
+        reset=reset,
+    )
+
+
+async def prune_content_changes(interval: float) -> None:
+    """Периодически удалять записи журнала старше срока хранения.
+
+    Триггеры пишут журнал при каждом сохранении в админке, в том числе
+    до первой публикации и между публикациями.
+    """
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await content_change_crud.prune(
+                    keep=CONTENT_CHANGES_KEEP, session=session,
+                )
+                await session.commit()
+        except Exception:
+            logging.exception('Не удалось удалить старые изменения контента')
+        await asyncio.sleep(interval)
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.app.core.const import MIN_PASSWORD_LEN
 from src.app.crud.user import user_crud
 from src.app.models.user import User, UserRolesEnum
+from src.app.services.auth_revocation import auth_revocations
 from src.app.services.user import get_password_hash
 
 
@@ -13,6 +14,7 @@ async def import_users_from_excel(
     """Read users from file and check correctness."""
     df = pd.read_excel(file_bytes)
     count = 0
+    telegram_ids = []
     for _, row in df.iterrows():
         # Login check.
         login = str(row['login']).strip()
@@ -66,7 +68,10 @@ async def import_users_from_excel(
             role=role,
         )
         session.add(user)
+        telegram_ids.append(user.telegram_id)
         count += 1
 
     await session.commit()
+    # Бот мог закешировать отказ в доступе для новых пользователей.
+    auth_revocations.revoke(*telegram_ids)
     return count
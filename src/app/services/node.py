@@ -1,17 +1,36 @@
 import os
-from typing import NoReturn
+import zlib
+from typing import NoReturn, TypeVar
 
 from fastapi import HTTPException, Request, status
-from sqlalchemy import and_, select
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.models.content import Node
+from src.app.core.config import settings
+from src.app.crud.node import node_crud
+from src.app.crud.release import release_crud
+from src.app.models.content import NodeLayoutTypeEnum
 from src.app.schemas.content import (
     ButtonResponse,
     ChildNodeResponse,
+    ContentGraphResponse,
+    GraphNodeResponse,
     ImageResponse,
     NodeResponse,
+    NodeSubtreeResponse,
+    content_graph_adapter,
+    node_adapter,
+    node_search_adapter,
+    node_subtree_adapter,
 )
+from src.app.services.cache import node_cache
+
+T = TypeVar('T', NodeResponse, GraphNodeResponse)
+
+
+def get_base_url(request: Request) -> str:
+    """Return backend address that image urls are built from."""
+    return settings.MEDIA_BASE_URL or str(request.base_url)
 
 
 def make_full_url(image_url: str, request: Request) -> str:
@@ -20,58 +39,59 @@ def make_full_url(image_url: str, request: Request) -> str:
         return ''
     if image_url.startswith('http'):
         return image_url
-    base_url = str(request.base_url).rstrip('/')
+    base_url = get_base_url(request).rstrip('/')
     filename = os.path.basename(image_url)
     return f'{base_url}/media/{filename}'
 
 
-async def enrich_node(
-    node: Node, session: AsyncSession, request: Request,
-) -> NodeResponse | NoReturn:
-    """Дополнить узел связанными кнопками и изображениями."""
-    if not node.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail='Node not found.',
-        )
-    await session.refresh(node, attribute_names=['outgoing_buttons', 'images'])
-
-    buttons = sorted([
-        ButtonResponse(
-            id=btn.id,
-            label=btn.label,
-            target_node_id=btn.target_node_id,
-            order=btn.order,
-        )
-        for btn in node.outgoing_buttons
-    ], key=lambda b: b.order)
+def make_etag(node_id: int | None, request: Request, depth: int = 0) -> str:
+    """Build strong ETag of node from content version without DB access."""
+    # Полные URL изображений зависят от адреса бэкенда.
+    base = zlib.crc32(get_base_url(request).encode())
+    key = 'root' if node_id is None else node_id
+    return f'"{node_cache.version}-{key}-{depth}-{base:x}"'
 
-    images = sorted([
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match header against ETag."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(',')}
+    return etag in tags or '*' in tags
+
+
+def make_images(row: Row, request: Request) -> list[ImageResponse]:
+    """Build image responses with full urls."""
+    return [
         ImageResponse(
-            id=img.id,
-            image_url=make_full_url(img.image_url, request),
-            order=img.order,
-        )
-        for img in node.images
-    ], key=lambda i: i.order)
-
-    get_children = await session.execute(
-        select(Node).where(
-            and_(
-                Node.parent_id == node.id,
-                Node.is_active),
-            ),
+            id=img['id'],
+            image_url=make_full_url(img['image_url'], request),
+            order=img['order'],
+            file_id=img['file_id'],
         )
+        for img in row.images
+    ]
 
-    children = [ChildNodeResponse(
-        id=child.id,
-        title=child.title,
-        text=child.text,
-        layout_type=child.layout_type,
-        parent_id=child.parent_id,
-        # buttons=child_buttons,
-        # images=child.images,
-    ) for child in get_children.scalars()]
 
+def make_node_response(
+    row: Row, images: list[ImageResponse],
+) -> NodeResponse:
+    """Собрать ответ узла из строки с JSON-агрегатами связей."""
+    node = row.Node
+    # Кнопки, изображения и потомки уже отфильтрованы и упорядочены в БД.
+    buttons = [ButtonResponse(**btn) for btn in row.buttons]
+    children = [
+        ChildNodeResponse(
+            id=child['id'],
+            title=child['title'],
+            text=child['text'],
+            # В JSON enum приходит именем, как он хранится в БД.
+            layout_type=NodeLayoutTypeEnum[child['layout_type']],
+            parent_id=child['parent_id'],
+        )
+        for child in row.children
+    ]
     return NodeResponse(
         id=node.id,
         title=node.title,
@@ -82,3 +102,229 @@ async def enrich_node(
         buttons=buttons,
         images=images,
     )
+
+
+def enrich_node(row: Row, request: Request) -> NodeResponse | NoReturn:
+    """Собрать ответ активного узла с полными URL изображений."""
+    if not row.Node.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail='Node not found.',
+        )
+    return make_node_response(row, make_images(row, request))
+
+
+def release_node(
+    payload: dict, request: Request, schema: type[T] = NodeResponse,
+) -> T:
+    """Собрать ответ узла из опубликованного релиза."""
+    node = schema.model_validate(payload)
+    # В релизе хранятся пути изображений, адрес зависит от запроса.
+    for image in node.images:
+        image.image_url = make_full_url(image.image_url, request)
+    return node
+
+
+def raise_node_not_found() -> NoReturn:
+    """Raise 404 for missing node."""
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail='Node not found',
+    )
+
+
+async def get_current_release_id(session: AsyncSession) -> int | None:
+    """Вернуть ID опубликованного релиза, читая его раз на версию контента.
+
+    Публикация меняет версию контента, поэтому ID живёт в кеше узлов, и
+    промах по узлу обходится одним запросом к БД, а не двумя.
+    """
+    async def build() -> tuple[int | None]:
+        # None кеш не хранит, поэтому кладём ID в кортеж.
+        return (await release_crud.get_current_id(session=session),)
+
+    (release_id,) = await node_cache.get_or_build(('release',), build)
+    return release_id
+
+
+async def get_content_graph_json(
+    session: AsyncSession, request: Request,
+) -> bytes:
+    """Вернуть JSON снимка всех активных узлов из кеша или собрать его."""
+    async def build() -> bytes:
+        version = node_cache.version
+        release_id = await get_current_release_id(session)
+        if release_id is not None:
+            nodes = [
+                release_node(payload, request, GraphNodeResponse)
+                for payload in await release_crud.get_all(
+                    release_id=release_id, session=session,
+                )
+            ]
+            return content_graph_adapter.dump_json(
+                ContentGraphResponse(version=version, nodes=nodes),
+            )
+        rows = await node_crud.get_hydrated_active(session=session)
+        nodes = [
+            GraphNodeResponse(
+                id=row.Node.id,
+                title=row.Node.title,
+                text=row.Node.text,
+                layout_type=row.Node.layout_type,
+                parent_id=row.Node.parent_id,
+                buttons=[ButtonResponse(**btn) for btn in row.buttons],
+                images=make_images(row, request),
+            )
+            for row in rows
+        ]
+        return content_graph_adapter.dump_json(
+            ContentGraphResponse(version=version, nodes=nodes),
+        )
+
+    return await node_cache.get_or_build(
+        ('graph', get_base_url(request)), build,
+    )
+
+
+async def get_node_json(
+    node_id: int | None, session: AsyncSession, request: Request,
+) -> bytes | NoReturn:
+    """Вернуть JSON узла из кеша или собрать его (None — корневой узел)."""
+    async def build() -> bytes:
+        release_id = await get_current_release_id(session)
+        if release_id is not None:
+            payload = await release_crud.get_payload(
+                release_id=release_id, node_id=node_id, session=session,
+            )
+            if payload is None:
+                raise_node_not_found()
+            return node_adapter.dump_json(release_node(payload, request))
+        if node_id is None:
+            row = await node_crud.get_hydrated_root(session=session)
+        else:
+            row = await node_crud.get_hydrated_by_id(
+                node_id=node_id, session=session,
+            )
+        if not row:
+            raise_node_not_found()
+        return node_adapter.dump_json(enrich_node(row, request))
+
+    # Полные URL изображений зависят от адреса бэкенда.
+    return await node_cache.get_or_build(
+        (node_id, get_base_url(request)), build,
+    )
+
+
+async def get_nodes_json(
+    node_ids: list[int], session: AsyncSession, request: Request,
+) -> bytes:
+    """Вернуть JSON-массив активных узлов, добирая из БД только промахи."""
+    base_url = get_base_url(request)
+    nodes = {}
+    missing = []
+    for node_id in dict.fromkeys(node_ids):
+        node = node_cache.get((node_id, base_url))
+        if node is None:
+            missing.append(node_id)
+        else:
+            nodes[node_id] = node
+    if missing:
+        version = node_cache.version
+        released = await release_crud.get_many(
+            node_ids=missing, session=session,
+        )
+        if released:
+            built = [
+                release_node(row.payload, request)
+                for row in released if row.payload is not None
+            ]
+        else:
+            built = [
+                enrich_node(row, request)
+                for row in await node_crud.get_hydrated_many(
+                    node_ids=missing, session=session,
+                )
+            ]
+        for node_response in built:
+            node = node_adapter.dump_json(node_response)
+            node_cache.put((node_response.id, base_url), node, version)
+            nodes[node_response.id] = node
+    # Узлы уже сериализованы по отдельности, массив собираем из готовых байт.
+    return b'[' + b','.join(
+        nodes[node_id] for node_id in node_ids if node_id in nodes
+    ) + b']'
+
+
+async def get_node_subtree_json(
+    node_id: int, depth: int, session: AsyncSession, request: Request,
+) -> bytes | NoReturn:
+    """Вернуть JSON узла вместе с узлами, достижимыми за depth шагов."""
+    async def build() -> bytes:
+        release_id = await get_current_release_id(session)
+        if release_id is not None:
+            payloads = await release_crud.get_subtree(
+                release_id=release_id,
+                node_id=node_id,
+                depth=depth,
+                session=session,
+            )
+            built = [release_node(payload, request) for payload in payloads]
+        else:
+            built = [
+                enrich_node(row, request)
+                for row in await node_crud.get_hydrated_subtree(
+                    node_id=node_id, depth=depth, session=session,
+                )
+            ]
+        nodes = {node.id: node for node in built}
+        node = nodes.pop(node_id, None)
+        if node is None:
+            raise_node_not_found()
+        return node_subtree_adapter.dump_json(
+            NodeSubtreeResponse(
+                **dict(node), prefetched=list(nodes.values()),
+            ),
+        )
+
+    return await node_cache.get_or_build(
+        (node_id, depth, get_base_url(request)), build,
+    )
+
+
+async def search_nodes_json(
+    query: str, limit: int, session: AsyncSession,
+) -> bytes:
+    """Вернуть JSON найденных узлов, самые релевантные первыми."""
+    # Запросы пользователей не кешируем: их много разных, а поиск идёт по
+    # GIN-индексу одним запросом.
+    release_id = await get_current_release_id(session)
+    if release_id is None:
+        rows = await node_crud.search(
+            query=query, limit=limit, session=session,
+        )
+    else:
+        # Ищем по опубликованным ответам, а не по черновикам в Node.
+        rows = await release_crud.search(
+            release_id=release_id, query=query, limit=limit, session=session,
+        )
+    return node_search_adapter.dump_json(
+        node_search_adapter.validate_python(rows, from_attributes=True),
+    )
+
+
+async def get_conditional_node_json(
+    node_id: int | None,
+    session: AsyncSession,
+    request: Request,
+    depth: int = 0,
+) -> tuple[bytes | None, str]:
+    """Return node JSON and its ETag, None instead of JSON if unchanged."""
+    etag = make_etag(node_id, request, depth)
+    if etag_matches(request, etag):
+        return None, etag
+    if depth and node_id is not None:
+        content = await get_node_subtree_json(
+            node_id, depth, session, request,
+        )
+    else:
+        content = await get_node_json(node_id, session, request)
+    return content, etag
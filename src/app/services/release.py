@@ -0,0 +1,92 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.const import CONTENT_CHANGES_KEEP
+from src.app.crud.content_change import content_change_crud
+from src.app.crud.node import node_crud
+from src.app.crud.release import release_crud
+from src.app.models.content import ContentChange
+from src.app.models.release import ContentRelease, ReleaseNode
+from src.app.schemas.content import ImageResponse
+from src.app.services.cache import node_cache
+from src.app.services.node import make_node_response
+
+
+async def publish_release(
+    session: AsyncSession, published_by: str | None = None,
+) -> ContentRelease:
+    """Собрать релиз из активных узлов и сделать его текущим.
+
+    Ответы узлов сохраняются целиком, поэтому чтение релиза — один запрос
+    по ключу. Старые релизы не меняются: переключение указателя происходит
+    в той же транзакции, и пользователи не видят недоредактированный
+    контент.
+    """
+    rows = await node_crud.get_hydrated_active(
+        session=session, with_children=True,
+    )
+    payloads = {}
+    edges = {}
+    root_id = None
+    for row in rows:
+        node = make_node_response(
+            row, [ImageResponse(**img) for img in row.images],
+        )
+        payloads[node.id] = node.model_dump(mode='json')
+        edges[node.id] = list(dict.fromkeys(
+            [btn.target_node_id for btn in node.buttons] +
+            [child.id for child in node.children],
+        ))
+        if node.parent_id is None:
+            root_id = node.id
+
+    previous_id = await release_crud.get_current_id(session=session)
+    previous = {}
+    if previous_id is not None:
+        previous = await release_crud.get_payloads(
+            release_id=previous_id, session=session,
+        )
+
+    release = ContentRelease(
+        root_id=root_id,
+        nodes_count=len(payloads),
+        published_by=published_by,
+    )
+    session.add(release)
+    await session.flush()
+    if payloads:
+        await session.execute(insert(ReleaseNode), [
+            {
+                'release_id': release.id,
+                'node_id': node_id,
+                'edges': edges[node_id],
+                'payload': payload,
+            }
+            for node_id, payload in payloads.items()
+        ])
+
+    # Сообщаем ленте изменений только об узлах, которые отличаются
+    # от предыдущего релиза.
+    changed = [
+        node_id for node_id in payloads.keys() | previous.keys()
+        if payloads.get(node_id) != previous.get(node_id)
+    ]
+    if changed:
+        await session.execute(insert(ContentChange), [
+            {
+                'table_name': ContentRelease.__tablename__,
+                'operation': 'PUBLISH',
+                'row_id': release.id,
+                'node_id': node_id,
+            }
+            for node_id in sorted(changed)
+        ])
+
+    await release_crud.set_current(release_id=release.id, session=session)
+    await release_crud.remove_old(session=session)
+    await content_change_crud.prune(
+        keep=CONTENT_CHANGES_KEEP, session=session,
+    )
+    await session.commit()
+    node_cache.invalidate()
+    return release
@@ -1,8 +1,28 @@
+import asyncio
+import os
+import secrets
+
 import httpx
+from fastapi import HTTPException, Header, status
 
 from src.app.core.config import settings
 
 TELEGRAM_BOT_TOKEN = settings.BOT_TOKEN
+TELEGRAM_API_URL = f'https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}'
+
+
+async def verify_bot_token(
+    x_bot_token: str | None = Header(None),
+) -> None:
+    """Allow request only with bot API token."""
+    if not (
+        settings.BOT_API_TOKEN and x_bot_token and
+        secrets.compare_digest(x_bot_token, settings.BOT_API_TOKEN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Not enough permissions',
+        )
 
 
 async def send_telegram_message(telegram_id: int, text: str) -> None:
@@ -11,7 +31,7 @@ async def send_telegram_message(telegram_id: int, text: str) -> None:
         print('BOT_TOKEN не задан в переменных окружения!')
         return False
 
-    url = f'https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage'
+    url = f'{TELEGRAM_API_URL}/sendMessage'
     data = {
         'chat_id': telegram_id,
         'text': text,
@@ -22,3 +42,34 @@ async def send_telegram_message(telegram_id: int, text: str) -> None:
             response.raise_for_status()
     except Exception as e:
         print(f'Ошибка отправки сообщения в Telegram: {e}')
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+async def upload_photo(chat_id: int, path: str) -> str | None:
+    """Upload photo to Telegram chat and return its file_id."""
+    try:
+        content = await asyncio.to_thread(_read_file, path)
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(
+                f'{TELEGRAM_API_URL}/sendPhoto',
+                data={'chat_id': chat_id, 'disable_notification': True},
+                files={'photo': (os.path.basename(path), content)},
+            )
+            response.raise_for_status()
+            message = response.json()['result']
+            # file_id остаётся действительным и после удаления сообщения.
+            await client.post(
+                f'{TELEGRAM_API_URL}/deleteMessage',
+                data={
+                    'chat_id': chat_id,
+                    'message_id': message['message_id'],
+                },
+            )
+    except Exception as e:
+        print(f'Ошибка загрузки изображения в Telegram: {e}')
+        return None
+    return message['photo'][-1]['file_id']
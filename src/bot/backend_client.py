@@ -1,9 +1,22 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Coroutine
 from typing import Any
 
 import httpx
 
+from bot.cache import LRUCache
 from bot.config import get_settings
-from bot.constants import HR_PAGE, HR_PAGE_SIZE
+from bot.constants import (
+    CHANGES_RETRY_DELAY,
+    HR_PAGE,
+    HR_PAGE_SIZE,
+    NODE_BATCH_SIZE,
+    SEARCH_LIMIT,
+)
+from bot.graph import ContentGraph
+from bot.metrics import InstrumentedTransport
+from bot.transport import LONG_POLL, CircuitBreaker, ResilientTransport
 
 settings = get_settings()
 
@@ -13,36 +26,385 @@ class BackendClient:
 
     def __init__(self, base_url: str) -> None:
         """Инициализирует BackendClient."""
-        self._client = httpx.AsyncClient(
-            base_url=base_url.rstrip('/'),
-            timeout=10,
+        self._base_url = base_url.rstrip('/')
+        self._app: Any = None
+        self._http: httpx.AsyncClient | None = None
+        self._transport: ResilientTransport | None = None
+        self._graph = ContentGraph(settings.GRAPH_CHECK_INTERVAL)
+        # Узлы по ID ('root' — корневой) вместе с ETag ответа.
+        self._nodes: LRUCache[tuple[str | None, dict[str, Any]]] = LRUCache(
+            max_size=settings.NODE_CACHE_SIZE,
+            ttl=settings.NODE_CACHE_TTL,
+            stale_ttl=settings.NODE_CACHE_STALE_TTL,
         )
+        # Решения об авторизации по Telegram ID.
+        self._auth: LRUCache[dict[str, Any]] = LRUCache(
+            max_size=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL,
+        )
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Возвращает HTTP-клиент, создавая его при первом запросе."""
+        if self._http is None:
+            self._http = self._connect()
+        return self._http
+
+    def _connect(self) -> httpx.AsyncClient:
+        """Создаёт HTTP-клиент до бэкенда по сети или в его приложение."""
+        headers = None
+        if self._app is None:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.BACKEND_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.BACKEND_MAX_KEEPALIVE,
+                ),
+                http2=settings.BACKEND_HTTP2,
+            )
+        else:
+            transport = httpx.ASGITransport(app=self._app)
+            # В одном процессе сжатие ответа — лишняя работа и для
+            # бэкенда, и для бота.
+            headers = {'Accept-Encoding': 'identity'}
+        self._transport = ResilientTransport(
+            transport,
+            max_concurrency=settings.BACKEND_CONCURRENCY,
+            queue_timeout=settings.BACKEND_QUEUE_TIMEOUT,
+            retries=settings.BACKEND_RETRIES,
+            backoff=settings.BACKEND_RETRY_BACKOFF,
+            breaker=CircuitBreaker(
+                settings.BACKEND_BREAKER_THRESHOLD,
+                settings.BACKEND_BREAKER_RESET,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=self._base_url,
+            headers=headers,
+            timeout=httpx.Timeout(
+                settings.BACKEND_TIMEOUT,
+                connect=settings.BACKEND_CONNECT_TIMEOUT,
+            ),
+            transport=InstrumentedTransport(self._transport),
+        )
+
+    def use_app(self, app: Any) -> None:
+        """Направляет запросы в ASGI-приложение бэкенда в этом процессе.
+
+        Запросы не проходят через сеть и HTTP-сервер, но адрес BACKEND_URL
+        по-прежнему задаёт хост, от которого строятся ссылки на картинки.
+        Вызывается до первого запроса: клиент создаётся при нём, и
+        сетевой клиент, который пришлось бы закрывать, не создаётся вовсе.
+        """
+        if self._http is not None:
+            raise RuntimeError('Клиент бэкенда уже создан')
+        self._app = app
 
     async def close(self) -> None:
         """Закрывает соединение с клиентом."""
-        await self._client.aclose()
+        for task in self._tasks.values():
+            task.cancel()
+        if self._http is not None:
+            await self._http.aclose()
 
     async def get_user(self, tg_id: int) -> dict[str, Any]:
         """Получает данные пользователя по Telegram ID."""
+        async def load() -> dict[str, Any]:
+            r = await self._client.post(
+                '/api/v1/auth/telegram',
+                json={'telegram_id': tg_id},
+            )
+            r.raise_for_status()
+            return r.json()
+
+        return await self._auth.get_or_load(tg_id, load)
+
+    async def bootstrap_session(self, tg_id: int) -> dict[str, Any]:
+        """Получает права пользователя и корневой узел одним запросом."""
         r = await self._client.post(
-            '/api/v1/auth/telegram',
+            '/api/v1/auth/telegram/session',
             json={'telegram_id': tg_id},
         )
         r.raise_for_status()
+        data = r.json()
+        self._auth.put(
+            tg_id, {'allowed': data['allowed'], 'role': data['role']},
+        )
+        if data['root'] is not None:
+            self._store_nodes([data['root']])
+        return data
+
+    async def _get_conditional(
+        self, url: str, cached: tuple[str | None, dict[str, Any]] | None,
+    ) -> tuple[str | None, dict[str, Any]]:
+        """GET с If-None-Match: при 304 возвращает сохранённое тело."""
+        etag = cached[0] if cached else None
+        headers = {'If-None-Match': etag} if etag else None
+        r = await self._client.get(url, headers=headers)
+        if r.status_code == httpx.codes.NOT_MODIFIED and cached:
+            return cached
+        r.raise_for_status()
+        return r.headers.get('ETag'), r.json()
+
+    async def get_graph(self) -> dict[str, Any]:
+        """Получает снимок всего графа контента."""
+        r = await self._client.get('/api/v1/nodes/graph')
+        r.raise_for_status()
         return r.json()
 
+    async def get_graph_version(self) -> int:
+        """Получает текущую версию контента."""
+        r = await self._client.get('/api/v1/nodes/graph/version')
+        r.raise_for_status()
+        return r.json()['version']
+
+    async def _ensure_graph(self) -> bool:
+        """Обновляет снимок графа, если на бэкенде сменилась версия."""
+        graph = self._graph
+        if graph.is_fresh():
+            return True
+        async with graph.lock:
+            if graph.is_fresh():
+                return True
+            try:
+                if (
+                    graph.version is None or
+                    await self.get_graph_version() != graph.version
+                ):
+                    graph.load(await self.get_graph())
+                graph.mark_checked()
+            except httpx.HTTPError as e:
+                logging.warning(f'Не удалось обновить граф контента: {e}')
+        return graph.version is not None
+
     async def get_root_node(self) -> dict[str, Any]:
         """Получает корневой узел диалога."""
-        r = await self._client.get('/api/v1/nodes/root')
-        r.raise_for_status()
-        return r.json()
+        if settings.GRAPH_PRELOAD and await self._ensure_graph():
+            node = self._graph.get(self._graph.root_id)
+            if node is not None:
+                return node
+
+        async def load() -> tuple[str | None, dict[str, Any]]:
+            return await self._get_conditional(
+                '/api/v1/nodes/root', self._nodes.peek('root'),
+            )
+
+        _, node = await self._nodes.get_or_load('root', load)
+        return node
 
     async def get_node(self, node_id: int) -> dict[str, Any]:
         """Получает данные узла диалога по его ID."""
-        r = await self._client.get(f'/api/v1/nodes/{node_id}')
+        if settings.GRAPH_PRELOAD and await self._ensure_graph():
+            node = self._graph.get(node_id)
+            if node is not None:
+                return node
+
+        async def load() -> tuple[str | None, dict[str, Any]]:
+            etag, node = await self._get_conditional(
+                f'/api/v1/nodes/{node_id}?depth={settings.PREFETCH_DEPTH}',
+                self._nodes.peek(node_id),
+            )
+            self._store_nodes(node.get('prefetched', []))
+            return etag, node
+
+        _, node = await self._nodes.get_or_load(node_id, load)
+        return node
+
+    def _store_nodes(self, nodes: list[dict[str, Any]]) -> None:
+        """Сохраняет в кеш узлы, полученные без ETag."""
+        for node in nodes:
+            self._nodes.put(node['id'], (None, node))
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Возвращает счётчики кеша узлов."""
+        return self._nodes.stats()
+
+    def auth_cache_stats(self) -> dict[str, Any]:
+        """Возвращает счётчики кеша авторизации."""
+        return self._auth.stats()
+
+    def transport_stats(self) -> dict[str, Any]:
+        """Возвращает очередь запросов к бэкенду и состояние размыкателя."""
+        if self._transport is None:
+            return {}
+        return self._transport.stats()
+
+    async def get_nodes(self, node_ids: list[int]) -> list[dict[str, Any]]:
+        """Получает несколько узлов одним запросом."""
+        r = await self._client.get(
+            '/api/v1/nodes', params={'ids': node_ids},
+        )
         r.raise_for_status()
         return r.json()
 
+    async def search_nodes(self, query: str) -> list[dict[str, Any]]:
+        """Ищет узлы по названию и тексту."""
+        r = await self._client.get(
+            '/api/v1/nodes/search',
+            params={'q': query, 'limit': SEARCH_LIMIT},
+        )
+        r.raise_for_status()
+        return r.json()
+
+    async def _long_poll(
+        self, url: str, since: int | None, wait_seconds: int,
+    ) -> dict[str, Any]:
+        """GET ленты с курсором, ожидая новых записей до wait_seconds."""
+        params = {'timeout': wait_seconds}
+        if since is not None:
+            params['since'] = since
+        r = await self._client.get(
+            url,
+            params=params,
+            timeout=self._client.timeout.read + wait_seconds,
+            extensions={LONG_POLL: True},
+        )
+        r.raise_for_status()
+        return r.json()
+
+    async def get_changes(
+        self, since: int | None, wait_seconds: int,
+    ) -> dict[str, Any]:
+        """Получает изменения контента после курсора, ожидая их до wait."""
+        return await self._long_poll(
+            '/api/v1/nodes/changes', since, wait_seconds,
+        )
+
+    async def get_revocations(
+        self, since: int | None, wait_seconds: int,
+    ) -> dict[str, Any]:
+        """Получает Telegram ID с изменёнными правами после курсора."""
+        return await self._long_poll(
+            '/api/v1/auth/revocations', since, wait_seconds,
+        )
+
+    async def _apply_changes(
+        self, node_ids: list[int], content_version: int,
+    ) -> None:
+        """Обновляет в памяти только изменённые узлы."""
+        for node_id in node_ids:
+            self._nodes.pop(node_id)
+        root = self._nodes.peek('root')
+        if root is not None and root[1]['id'] in node_ids:
+            self._nodes.pop('root')
+        if self._graph.version is None:
+            return
+        nodes = []
+        for start in range(0, len(node_ids), NODE_BATCH_SIZE):
+            nodes += await self.get_nodes(
+                node_ids[start:start + NODE_BATCH_SIZE],
+            )
+        self._graph.apply(node_ids, nodes, content_version)
+
+    async def _poll_changes(self, cursor: int | None) -> int:
+        """Применяет очередную порцию изменений контента."""
+        data = await self.get_changes(cursor, settings.CHANGES_POLL_TIMEOUT)
+        if data.get('reset'):
+            # Часть изменений после курсора уже удалена на бэкенде.
+            self._nodes.clear()
+            self._graph.invalidate()
+        node_ids = list(dict.fromkeys(
+            change['node_id'] for change in data['changes']
+        ))
+        if node_ids:
+            await self._apply_changes(node_ids, data['content_version'])
+        return data['cursor']
+
+    async def _poll_revocations(self, cursor: int | None) -> int:
+        """Сбрасывает закешированные права изменённых пользователей."""
+        data = await self.get_revocations(
+            cursor, settings.CHANGES_POLL_TIMEOUT,
+        )
+        if data['reset']:
+            self._auth.clear()
+        for tg_id in data['telegram_ids']:
+            self._auth.pop(tg_id)
+        return data['cursor']
+
+    async def _follow(
+        self,
+        poll: Callable[[int | None], Awaitable[int]],
+        name: str,
+    ) -> None:
+        """Бесконечно опрашивает ленту, продвигая курсор."""
+        cursor = None
+        while True:
+            try:
+                cursor = await poll(cursor)
+            except asyncio.CancelledError:
+                raise
+            except httpx.HTTPError as e:
+                logging.warning(f'Не удалось получить {name}: {e}')
+                await asyncio.sleep(CHANGES_RETRY_DELAY)
+            except Exception:
+                # Без ленты кеши больше не сбросятся, поэтому задача не
+                # должна завершаться ни на какой ошибке разбора ответа.
+                logging.exception(f'Ошибка при обработке ленты: {name}')
+                await asyncio.sleep(CHANGES_RETRY_DELAY)
+
+    async def watch_changes(self) -> None:
+        """Следит за лентой изменений контента через long polling."""
+        await self._follow(self._poll_changes, 'изменения контента')
+
+    async def watch_revocations(self) -> None:
+        """Следит за отзывом прав пользователей через long polling."""
+        await self._follow(self._poll_revocations, 'отзывы прав')
+
+    async def report_cache_stats(self, interval: float) -> None:
+        """Периодически пишет статистику кеша узлов в лог."""
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.cache_stats()
+            logging.info(
+                f'Кеш узлов: {stats["size"]}/{stats["max_size"]} записей, '
+                f'{stats["memory_bytes"] / 1024:.0f} КБ, '
+                f'попаданий {stats["hit_ratio"]:.1%} '
+                f'(устаревших {stats["stale_hits"]}, '
+                f'промахов {stats["misses"]})',
+            )
+
+    def _start_task(self, name: str, coro: Coroutine) -> None:
+        """Запускает фоновую задачу клиента, если она ещё не запущена."""
+        if name in self._tasks:
+            coro.close()
+            return
+        self._tasks[name] = asyncio.create_task(coro)
+
+    def start_watching_changes(self) -> None:
+        """Запускает фоновое отслеживание изменений контента."""
+        self._start_task('watch_changes', self.watch_changes())
+
+    def start_watching_revocations(self) -> None:
+        """Запускает фоновое отслеживание отзыва прав."""
+        self._start_task('watch_revocations', self.watch_revocations())
+
+    def start_reporting_cache_stats(self, interval: float) -> None:
+        """Запускает периодическую запись статистики кеша в лог."""
+        self._start_task(
+            'report_cache_stats', self.report_cache_stats(interval),
+        )
+
+    async def warm_nodes(self, node_ids: list[int]) -> None:
+        """Загружает узлы, которых ещё нет в памяти, пачками до предела API."""
+        if settings.GRAPH_PRELOAD and self._graph.is_fresh():
+            return
+        missing = [
+            node_id for node_id in dict.fromkeys(node_ids)
+            if self._nodes.get(node_id) is None
+        ]
+        for start in range(0, len(missing), NODE_BATCH_SIZE):
+            self._store_nodes(await self.get_nodes(
+                missing[start:start + NODE_BATCH_SIZE],
+            ))
+
+    async def save_image_file_ids(self, items: list[dict[str, Any]]) -> None:
+        """Сохраняет на бэкенде file_id отправленных изображений."""
+        r = await self._client.put(
+            '/api/v1/images/file-ids',
+            json=items,
+            headers={'X-Bot-Token': settings.BOT_API_TOKEN},
+        )
+        r.raise_for_status()
+
     async def send_hr_request(self, tg_id: int, message: str) -> str:
         """Отправляет HR запрос."""
         r = await self._client.post(
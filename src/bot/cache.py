@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+V = TypeVar('V')
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Оценивает размер JSON-подобного объекта в памяти, байт."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key) + deep_sizeof(value)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item) for item in obj)
+    return size
+
+
+class LRUCache(Generic[V]):
+    """Ограниченный LRU-кеш с TTL и обновлением устаревших записей в фоне.
+
+    Свежая запись отдаётся сразу. Устаревшая, но не старше stale_ttl,
+    тоже отдаётся сразу, а в фоне запускается её обновление. Параллельные
+    промахи по одному ключу объединяются в одну загрузку.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: float, stale_ttl: float = 0,
+    ) -> None:
+        """Инициализирует пустой кеш."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        # Ключ -> (время сохранения, значение, размер в байтах).
+        self._entries: OrderedDict[Hashable, tuple[float, V, int]] = (
+            OrderedDict()
+        )
+        self._memory = 0
+        self._loading: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Возвращает число записей."""
+        return len(self._entries)
+
+    def peek(self, key: Hashable) -> V | None:
+        """Возвращает значение любой давности без учёта в статистике."""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def get(self, key: Hashable) -> V | None:
+        """Возвращает свежее значение или None."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Сохраняет значение, вытесняя самые давние записи."""
+        self.pop(key)
+        size = deep_sizeof(value)
+        self._entries[key] = (time.monotonic(), value, size)
+        self._memory += size
+        while len(self._entries) > self.max_size:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._memory -= evicted_size
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись, результат идущей загрузки не сохранится."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory -= entry[2]
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        self._entries.clear()
+        self._memory = 0
+        self._loading.clear()
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[V]],
+    ) -> V:
+        """Возвращает значение из кеша или загружает его один раз."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._loading:
+                    self._start_loading(key, load).add_done_callback(
+                        self._log_refresh_error,
+                    )
+                return entry[1]
+        self.misses += 1
+        task = self._loading.get(key) or self._start_loading(key, load)
+        # Отмена одного ожидающего не должна отменять загрузку для других.
+        return await asyncio.shield(task)
+
+    def _start_loading(
+        self, key: Hashable, load: Callable[[], Awaitable[V]],
+    ) -> asyncio.Task:
+        """Запускает загрузку ключа и сохраняет результат в кеш."""
+        async def run() -> V:
+            value = await load()
+            # Если запись удалили во время загрузки, значение могло устареть.
+            if self._loading.get(key) is task:
+                self.put(key, value)
+            return value
+
+        def done(_: asyncio.Task) -> None:
+            if self._loading.get(key) is task:
+                del self._loading[key]
+
+        task = asyncio.create_task(run())
+        task.add_done_callback(done)
+        self._loading[key] = task
+        return task
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task) -> None:
+        """Логирует ошибку фонового обновления, оставляя старую запись."""
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(
+                f'Не удалось обновить запись кеша: {task.exception()}',
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает счётчики кеша."""
+        requests = self.hits + self.stale_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'memory_bytes': self._memory,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': (
+                (self.hits + self.stale_hits) / requests if requests else 0.0
+            ),
+        }
@@ -13,6 +13,7 @@ from bot.handlers import (
 )
 from bot.services import (
     _initialize_session_and_goto_root,
+    ensure_allowed,
     goto_node,
 )
 
@@ -40,6 +41,9 @@ async def on_callback_query(
         await _initialize_session_and_goto_root(update, ctx)
         return
 
+    if not await ensure_allowed(update, ctx):
+        return
+
     data = query.data
 
     if ctx.user_data.get('waiting_for_hr_message'):
@@ -0,0 +1,60 @@
+"""Бот и бэкенд в одном процессе и одном цикле событий.
+
+Бэкенд обслуживает админку и API как обычно, а бот обращается к нему
+через ASGI-транспорт без сети и HTTP-сервера. Бот стартует после запуска
+бэкенда и останавливается до его остановки.
+
+Запуск из корня репозитория: PYTHONPATH=src python -m bot.colocated
+"""
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+
+from bot.backend_client import backend
+from bot.config import get_settings
+from bot.main import build_application
+from bot.webhook import start_application, stop_application, webhook_route
+
+from src.app.main import app
+
+settings = get_settings()
+
+
+def attach_bot(app: FastAPI) -> None:
+    """Встраивает запуск бота в жизненный цикл приложения бэкенда."""
+    webhook = settings.BOT_MODE == 'webhook'
+    application = build_application(with_updater=not webhook)
+    if webhook:
+        app.router.routes.append(webhook_route(application))
+    backend.use_app(app)
+    backend_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Запускает бота между стартом и остановкой бэкенда."""
+        async with backend_lifespan(app):
+            await start_application(application)
+            try:
+                yield
+            finally:
+                await stop_application(application)
+
+    app.router.lifespan_context = lifespan
+
+
+def main() -> None:
+    """Запускает бэкенд вместе с ботом."""
+    attach_bot(app)
+    uvicorn.run(
+        app,
+        host=settings.COLOCATED_HOST,
+        port=settings.COLOCATED_PORT,
+        proxy_headers=True,
+        forwarded_allow_ips='*',
+    )
+
+
+if __name__ == '__main__':
+    main()
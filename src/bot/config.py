@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from telegram.constants import FloodLimit
 
 
 class Settings(BaseSettings):
@@ -8,8 +10,52 @@ class Settings(BaseSettings):
 
     BOT_TOKEN: str
     BACKEND_URL: str
+    BACKEND_TIMEOUT: float = 5
+    BACKEND_CONNECT_TIMEOUT: float = 2
+    BACKEND_MAX_CONNECTIONS: int = 50
+    BACKEND_MAX_KEEPALIVE: int = 20
+    BACKEND_HTTP2: bool = False
+    BACKEND_CONCURRENCY: int = 50
+    BACKEND_QUEUE_TIMEOUT: float = 2
+    BACKEND_RETRIES: int = 2
+    BACKEND_RETRY_BACKOFF: float = 0.1
+    BACKEND_BREAKER_THRESHOLD: int = 5
+    BACKEND_BREAKER_RESET: float = 10
+    BOT_API_TOKEN: str | None = None
+    BOT_MODE: Literal['polling', 'webhook'] = 'polling'
+    WEBHOOK_URL: str | None = None
+    WEBHOOK_PATH: str = '/telegram/webhook'
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = '0.0.0.0'
+    WEBHOOK_PORT: int = 8080
+    COLOCATED_HOST: str = '0.0.0.0'
+    COLOCATED_PORT: int = 8000
+    UPDATE_CONCURRENCY: int = 64
     STACK_LIMIT: int = 20
     STOP_WORDS: list[str]
+    SWEAR_WORKERS: int = 1
+    SWEAR_CACHE_SIZE: int = 1000
+    GRAPH_PRELOAD: bool = True
+    GRAPH_CHECK_INTERVAL: int = 30
+    PREFETCH_DEPTH: int = 1
+    NODE_CACHE_SIZE: int = 1000
+    NODE_CACHE_TTL: int = 30
+    NODE_CACHE_STALE_TTL: int = 300
+    RENDER_CACHE_SIZE: int = 2000
+    CACHE_STATS_INTERVAL: int = 300
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL: int = 300
+    WATCH_REVOCATIONS: bool = True
+    WATCH_CHANGES: bool = True
+    CHANGES_POLL_TIMEOUT: int = 25
+    SESSION_REDIS_URL: str | None = None
+    SESSION_TTL: int = 30 * 24 * 60 * 60
+    SEND_GLOBAL_RATE: float = FloodLimit.MESSAGES_PER_SECOND
+    SEND_PRIVATE_RATE: float = FloodLimit.MESSAGES_PER_SECOND_PER_CHAT
+    SEND_GROUP_RATE: float = FloodLimit.MESSAGES_PER_MINUTE_PER_GROUP / 60
+    SEND_MAX_RETRIES: int = 3
+    METRICS_HOST: str = '127.0.0.1'
+    METRICS_PORT: int = 9108
 
     model_config = SettingsConfigDict(
         env_file=(Path(__file__).parents[2] / 'infra' / '.env').resolve(),
@@ -1,6 +1,7 @@
 LAYOUT_TEXT = 'TEXT'
 LAYOUT_TEXT_IMAGE = 'TEXT_IMAGE'
 LAYOUT_GALLERY = 'GALLERY'
+LAST_MESSAGE_KEY = 'last_message_id'
 HR_QUESTION_NODE_TITLE = 'не нашел ответ на свой вопрос?'
 
 ADMIN_PANEL_ROLES = {'Администратор', 'Менеджер'}
@@ -13,9 +14,24 @@ COMMON_BTNS = {
     'my_requests': '💬 Мои вопросы',
 }
 
+NODE_BATCH_SIZE = 100
+CHANGES_RETRY_DELAY = 5
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+SEND_GLOBAL_BURST = 30
+SEND_CHAT_BURST = 3
+SEND_CHATS_LIMIT = 1000
+
+STACK_BUCKETS = (1, 2, 5, 10, 20, float('inf'))
+METRICS_SNAPSHOT_TIMEOUT = 5
+
+SEARCH_LIMIT = 5
+SEARCH_MIN_LEN = 2
+SEARCH_MAX_LEN = 200
+
 HR_PAGE = 0
 HR_PAGE_SIZE = 5
 
 MIN_MESSAGE_LEN = 30
-SWEAR_PREDICT = 1
 SWEAR_PROBA = 0.33
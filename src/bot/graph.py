@@ -0,0 +1,75 @@
+import asyncio
+import time
+from typing import Any
+
+CHILD_FIELDS = ('id', 'title', 'text', 'layout_type', 'parent_id')
+
+
+class ContentGraph:
+    """Снимок всего графа контента в памяти бота."""
+
+    def __init__(self, check_interval: float) -> None:
+        """Инициализирует пустой граф."""
+        self.check_interval = check_interval
+        self.version: int | None = None
+        self.root_id: int | None = None
+        self.lock = asyncio.Lock()
+        self._nodes: dict[int, dict[str, Any]] = {}
+        self._checked_at = 0.0
+
+    def load(self, payload: dict[str, Any]) -> None:
+        """Заменяет граф новым снимком с бэкенда."""
+        nodes = {}
+        for node in payload['nodes']:
+            nodes[node['id']] = {**node, 'children': []}
+        root_id = None
+        for node in nodes.values():
+            parent = nodes.get(node['parent_id'])
+            if node['parent_id'] is None:
+                root_id = node['id']
+            elif parent is not None:
+                parent['children'].append(
+                    {field: node[field] for field in CHILD_FIELDS},
+                )
+        self._nodes = nodes
+        self.root_id = root_id
+        self.version = payload['version']
+        self.mark_checked()
+
+    def apply(
+        self,
+        node_ids: list[int],
+        nodes: list[dict[str, Any]],
+        version: int,
+    ) -> None:
+        """Заменяет изменённые узлы свежими, не трогая остальные.
+
+        Узлы из node_ids, которых нет в nodes, удалены или отключены.
+        """
+        for node_id in node_ids:
+            self._nodes.pop(node_id, None)
+        for node in nodes:
+            self._nodes[node['id']] = node
+            if node['parent_id'] is None:
+                self.root_id = node['id']
+        self.version = version
+        self.mark_checked()
+
+    def invalidate(self) -> None:
+        """Помечает снимок устаревшим: следующий запрос загрузит его заново."""
+        self.version = None
+
+    def mark_checked(self) -> None:
+        """Запоминает время последней проверки версии."""
+        self._checked_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        """Проверяет, не пора ли сверить версию с бэкендом."""
+        return (
+            self.version is not None and
+            time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def get(self, node_id: int | None) -> dict[str, Any] | None:
+        """Возвращает узел по ID или None, если его нет в снимке."""
+        return self._nodes.get(node_id)
@@ -1,7 +1,7 @@
 import asyncio
+import logging
 from collections import deque
 
-from check_swear import SwearingCheck
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -11,18 +11,18 @@ from bot.constants import (
     HR_PAGE,
     HR_PAGE_SIZE,
     MIN_MESSAGE_LEN,
-    SWEAR_PREDICT,
-    SWEAR_PROBA,
+    SEARCH_MAX_LEN,
+    SEARCH_MIN_LEN,
 )
-from bot.keyboards import make_nav_kb, make_pagination_kb
+from bot.keyboards import make_nav_kb, make_pagination_kb, make_search_kb
 from bot.services import (
     _initialize_session_and_goto_root,
-    check_user_allowed_and_role,
+    ensure_allowed,
     goto_node,
 )
+from bot.swear import swear_checker
 
 settings = get_settings()
-sch = SwearingCheck(stop_words=settings.STOP_WORDS)
 
 
 async def handle_start(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
@@ -104,18 +104,54 @@ async def handle_my_requests(
     )
 
 
+async def handle_search(
+    update: Update, ctx: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    """Search nodes by user's message and offer matches as buttons."""
+    query = update.message.text.strip()
+    if not SEARCH_MIN_LEN <= len(query) <= SEARCH_MAX_LEN:
+        await update.message.reply_text(
+            'Напиши, что ищешь, например: «отпуск» или «больничный».',
+        )
+        return
+
+    try:
+        results = await backend.search_nodes(query)
+    except Exception as e:
+        logging.warning(f'Поиск по запросу {query!r} не удался: {e}')
+        await update.message.reply_text(
+            'Ошибка при поиске. Попробуй позже.',
+        )
+        return
+
+    if not results:
+        await update.message.reply_text(
+            'Ничего не нашлось. Попробуй другие слова или выбери раздел '
+            'в меню.',
+            reply_markup=make_nav_kb(),
+        )
+        return
+
+    # Переход по найденному узлу идёт через обычный колбэк с его ID.
+    ctx.user_data.setdefault('stack', deque(maxlen=settings.STACK_LIMIT))
+    await update.message.reply_text(
+        'Вот что нашлось:', reply_markup=make_search_kb(results),
+    )
+
+
 async def handle_hr_message(
     update: Update,
     ctx: ContextTypes.DEFAULT_TYPE,
 ) -> None:
-    """Handle incoming user message as HR request if waiting."""
+    """Handle incoming user message as HR request or search query."""
+    waiting = ctx.user_data.get('waiting_for_hr_message')
+    if not await ensure_allowed(update, ctx):
+        return
     user_id = update.effective_user.id
-    allowed, is_admin = await check_user_allowed_and_role(user_id)
-    ctx.user_data['is_admin'] = is_admin
+    is_admin = ctx.user_data['is_admin']
 
-    if not allowed:
-        await update.message.reply_text('Доступ запрещен. Обратись к HR.')
-        ctx.user_data.pop('waiting_for_hr_message', None)
+    if not waiting:
+        await handle_search(update, ctx)
         return
 
     if is_admin:
@@ -135,10 +171,15 @@ async def handle_hr_message(
                 '(минимум 30 символов).',
             )
             return
-        if (
-            sch.predict(message_text_raw)[0] == SWEAR_PREDICT or
-            sch.predict_proba(message_text_raw)[0] >= SWEAR_PROBA
-        ):
+        try:
+            swearing = await swear_checker.is_swearing(message_text_raw)
+        except Exception:
+            await update.message.reply_text(
+                'Не удалось проверить сообщение. Попробуй отправить его '
+                'ещё раз чуть позже.',
+            )
+            return
+        if swearing:
             await update.message.reply_text(
                 'Сообщение вероятно содержит грубые выражения. '
                 'Пожалуйста, переформулируй.',
@@ -12,7 +12,6 @@ def make_inline_kb(
     node_buttons: List[Dict], *,
     include_back: bool = True,
     is_admin: bool = False,
-    user_id: int | None = None,
     current_node_title: str,
 ) -> InlineKeyboardMarkup:
     """Создает клавиатуру для Telegram бота."""
@@ -28,7 +27,7 @@ def make_inline_kb(
         rows.append([InlineKeyboardButton(COMMON_BTNS['my_requests'],
                     callback_data=COMMON_BTNS['my_requests'])])
 
-    if is_admin and user_id is not None:
+    if is_admin:
         rows.append([
             InlineKeyboardButton(
                 text='Админ‑панель',
@@ -61,6 +60,20 @@ def make_nav_kb() -> InlineKeyboardMarkup:
     ])
 
 
+def make_search_kb(results: List[Dict]) -> InlineKeyboardMarkup:
+    """Return inline keyboard with found nodes and 'Home' button."""
+    rows = [
+        [InlineKeyboardButton(
+            node['title'], callback_data=str(node['id']),
+        )]
+        for node in results
+    ]
+    rows.append([InlineKeyboardButton(
+        COMMON_BTNS['home'], callback_data=COMMON_BTNS['home'],
+    )])
+    return InlineKeyboardMarkup(rows)
+
+
 def make_pagination_kb(has_prev: bool, has_next: bool) -> InlineKeyboardMarkup:
     """Return inline keyboard with 'Back', 'Next' and 'Home' buttons."""
     buttons = []
@@ -1,5 +1,6 @@
 import logging
 
+import uvicorn
 from telegram.ext import (
     Application,
     ApplicationBuilder,
@@ -8,11 +9,24 @@ from telegram.ext import (
     MessageHandler,
     filters,
 )
+from telegram.request import BaseRequest, HTTPXRequest
 
 from bot.backend_client import backend
 from bot.callbacks import on_callback_query
 from bot.config import get_settings
 from bot.handlers import handle_hr_message, handle_start
+from bot.metrics import (
+    BotCollector,
+    InstrumentedRequest,
+    callback_kind,
+    start_metrics_server,
+    timed,
+)
+from bot.rate_limiter import OutboundScheduler
+from bot.session import RedisSessionStore, SessionApplication
+from bot.swear import swear_checker
+from bot.update_processor import OrderedUpdateProcessor
+from bot.webhook import create_app
 
 settings = get_settings()
 logging.basicConfig(
@@ -21,29 +35,103 @@ logging.basicConfig(
 )
 
 
+async def on_startup(application: Application) -> None:
+    """Start background feeds tracking and cache reports."""
+    swear_checker.start()
+    if settings.WATCH_CHANGES:
+        backend.start_watching_changes()
+    if settings.WATCH_REVOCATIONS:
+        backend.start_watching_revocations()
+    if settings.CACHE_STATS_INTERVAL:
+        backend.start_reporting_cache_stats(settings.CACHE_STATS_INTERVAL)
+    if settings.METRICS_PORT:
+        collector = BotCollector(application, {
+            'backend': backend.transport_stats,
+            'node_cache': backend.cache_stats,
+            'auth_cache': backend.auth_cache_stats,
+            'swear_cache': swear_checker.stats,
+            'outbound': application.bot.rate_limiter.stats,
+            'updates': application.update_processor.stats,
+        })
+        application.bot_data['stop_metrics'] = start_metrics_server(
+            collector, settings.METRICS_HOST, settings.METRICS_PORT,
+        )
+
+
 async def on_shutdown(application: Application) -> None:
     """Gracefully closes the backend connection on application shutdown."""
+    logging.info(f'Статистика кеша узлов: {backend.cache_stats()}')
+    logging.info(f'Статистика запросов к бэкенду: {backend.transport_stats()}')
+    logging.info(
+        f'Статистика отправки: {application.bot.rate_limiter.stats()}',
+    )
+    logging.info(
+        f'Статистика обработки: {application.update_processor.stats()}',
+    )
+    if 'stop_metrics' in application.bot_data:
+        application.bot_data.pop('stop_metrics')()
+    swear_checker.close()
     await backend.close()
 
 
-def main() -> None:
-    """Запускает приложение."""
-    application = (
+def build_application(
+    with_updater: bool = True, request: BaseRequest | None = None,
+) -> Application:
+    """Собирает приложение бота со всеми обработчиками."""
+    # Пул соединений по умолчанию, как у ApplicationBuilder.
+    request = request or HTTPXRequest(connection_pool_size=256)
+    builder = (
         ApplicationBuilder()
         .token(settings.BOT_TOKEN)
-        .concurrent_updates(True)
+        .request(InstrumentedRequest(request))
+    )
+    if settings.SESSION_REDIS_URL:
+        builder = builder.application_class(
+            SessionApplication,
+            kwargs={'session_store': RedisSessionStore(
+                settings.SESSION_REDIS_URL, settings.SESSION_TTL,
+            )},
+        )
+    if not with_updater:
+        # Обновления приходят через вебхук, опрос getUpdates не нужен.
+        builder = builder.updater(None)
+    application = (
+        builder
+        .concurrent_updates(
+            OrderedUpdateProcessor(settings.UPDATE_CONCURRENCY),
+        )
+        .rate_limiter(OutboundScheduler(
+            global_rate=settings.SEND_GLOBAL_RATE,
+            private_rate=settings.SEND_PRIVATE_RATE,
+            group_rate=settings.SEND_GROUP_RATE,
+            max_retries=settings.SEND_MAX_RETRIES,
+        ))
+        .post_init(on_startup)
         .post_shutdown(on_shutdown)
         .build()
     )
 
-    application.add_handler(CommandHandler('start', handle_start))
-    application.add_handler(CommandHandler('menu', handle_start))
-    application.add_handler(CallbackQueryHandler(on_callback_query))
+    start = timed('start')(handle_start)
+    application.add_handler(CommandHandler('start', start))
+    application.add_handler(CommandHandler('menu', start))
+    application.add_handler(CallbackQueryHandler(
+        timed(callback_kind)(on_callback_query)))
     application.add_handler(MessageHandler(
-        filters.TEXT & ~filters.COMMAND, handle_hr_message))
+        filters.TEXT & ~filters.COMMAND, timed('message')(handle_hr_message)))
+    return application
 
+
+def main() -> None:
+    """Запускает приложение."""
+    if settings.BOT_MODE == 'webhook':
+        uvicorn.run(
+            create_app(build_application(with_updater=False)),
+            host=settings.WEBHOOK_HOST,
+            port=settings.WEBHOOK_PORT,
+        )
+        return
     logging.info('Bot starting…')
-    application.run_polling(drop_pending_updates=True)
+    build_application().run_polling(drop_pending_updates=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from telegram import Message
+from telegram.error import BadRequest
+
+from bot.backend_client import backend
+from bot.config import get_settings
+
+settings = get_settings()
+
+PhotoSource = Callable[[dict[str, Any]], str]
+
+
+class FileIdStore:
+    """file_id изображений, уже загруженных в Telegram, по ID изображения.
+
+    Повторная отправка по file_id не заставляет Telegram скачивать файл
+    с бэкенда. Новые file_id сохраняются на бэкенде в фоне.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустое хранилище."""
+        self._file_ids: dict[int, str] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def get(self, image: dict[str, Any]) -> str | None:
+        """Возвращает известный file_id изображения."""
+        return self._file_ids.get(image['id']) or image.get('file_id')
+
+    def source(self, image: dict[str, Any]) -> str:
+        """Возвращает file_id изображения или его URL."""
+        return self.get(image) or image['image_url']
+
+    def forget(self, images: list[dict[str, Any]]) -> None:
+        """Забывает file_id, которые Telegram не принял."""
+        for image in images:
+            self._file_ids.pop(image['id'], None)
+            image['file_id'] = None
+
+    def remember(
+        self, images: list[dict[str, Any]], messages: Sequence[Message],
+    ) -> None:
+        """Запоминает file_id из отправленных сообщений."""
+        new = []
+        for image, message in zip(images, messages):
+            if not message.photo:
+                continue
+            if self.get(image) is None:
+                new.append({
+                    'image_id': image['id'],
+                    'file_id': message.photo[-1].file_id,
+                })
+            self._file_ids[image['id']] = message.photo[-1].file_id
+        if new and settings.BOT_API_TOKEN:
+            task = asyncio.create_task(self._save(new))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _save(items: list[dict[str, Any]]) -> None:
+        """Сохраняет новые file_id на бэкенде."""
+        try:
+            await backend.save_image_file_ids(items)
+        except Exception as e:
+            logging.warning(f'Не удалось сохранить file_id изображений: {e}')
+
+
+file_ids = FileIdStore()
+
+
+def is_not_modified(error: BadRequest) -> bool:
+    """Проверяет, что правка не нужна: сообщение уже такое же."""
+    return 'message is not modified' in str(error).lower()
+
+
+async def send_photos(
+    images: list[dict[str, Any]],
+    send: Callable[[PhotoSource], Awaitable[Message | Sequence[Message]]],
+) -> Message | Sequence[Message]:
+    """Отправляет фото по file_id, при отказе Telegram — по URL."""
+    try:
+        result = await send(file_ids.source)
+    except BadRequest as e:
+        if is_not_modified(e) or not any(
+            file_ids.get(image) for image in images
+        ):
+            raise
+        logging.warning('Telegram не принял file_id, отправляем по URL')
+        file_ids.forget(images)
+        result = await send(lambda image: image['image_url'])
+    messages = result if isinstance(result, Sequence) else [result]
+    file_ids.remember(images, messages)
+    return result
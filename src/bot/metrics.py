@@ -0,0 +1,266 @@
+import asyncio
+import functools
+import re
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import Future
+from typing import Any
+
+import httpx
+from prometheus_client import REGISTRY, Counter, Histogram, start_http_server
+from prometheus_client.core import (
+    GaugeHistogramMetricFamily,
+    GaugeMetricFamily,
+)
+from prometheus_client.registry import Collector
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+from telegram.request import BaseRequest, RequestData
+
+from bot.constants import (
+    COMMON_BTNS,
+    METRICS_SNAPSHOT_TIMEOUT,
+    STACK_BUCKETS,
+)
+
+HANDLER_SECONDS = Histogram(
+    'bot_handler_seconds',
+    'Время обработки обновления по типу действия',
+    ['kind'],
+)
+BACKEND_SECONDS = Histogram(
+    'bot_backend_request_seconds',
+    'Время запроса к бэкенду с учётом очереди и повторов',
+    ['method', 'endpoint'],
+)
+BACKEND_ERRORS = Counter(
+    'bot_backend_errors',
+    'Неудачные запросы к бэкенду',
+    ['method', 'endpoint', 'error'],
+)
+TELEGRAM_SECONDS = Histogram(
+    'bot_telegram_request_seconds',
+    'Время вызова метода Bot API',
+    ['method'],
+)
+TELEGRAM_FLOOD = Counter(
+    'bot_telegram_flood',
+    'Ответы 429 Too Many Requests от Bot API',
+    ['method'],
+)
+SWEAR_CHECK_SECONDS = Histogram(
+    'bot_swear_check_seconds',
+    'Время проверки сообщения на грубые выражения',
+)
+UPDATE_WAIT_SECONDS = Histogram(
+    'bot_update_wait_seconds',
+    'Ожидание обновления в очереди чата и в общей очереди',
+    ['queue'],
+)
+
+CALLBACK_KINDS = {data: kind for kind, data in COMMON_BTNS.items()}
+ID_PATTERN = re.compile(r'/\d+')
+
+Handler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]
+
+
+def callback_kind(update: Update) -> str:
+    """Возвращает тип нажатой кнопки без ID узла."""
+    data = update.callback_query.data or ''
+    if data.isdigit():
+        return 'node'
+    if data in ('hr_next', 'hr_prev'):
+        return data
+    return CALLBACK_KINDS.get(data, 'other')
+
+
+def timed(kind: str | Callable[[Update], str]) -> Callable[[Handler], Handler]:
+    """Замеряет время обработчика в HANDLER_SECONDS."""
+
+    def decorator(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        async def wrapper(
+            update: Update, ctx: ContextTypes.DEFAULT_TYPE,
+        ) -> None:
+            label = kind if isinstance(kind, str) else kind(update)
+            with HANDLER_SECONDS.labels(label).time():
+                await handler(update, ctx)
+
+        return wrapper
+
+    return decorator
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Транспорт httpx, замеряющий запросы к бэкенду по эндпоинтам."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        """Оборачивает транспорт, выполняющий сами запросы."""
+        self._transport = transport
+
+    async def handle_async_request(
+        self, request: httpx.Request,
+    ) -> httpx.Response:
+        """Отправляет запрос и учитывает его время и ошибку."""
+        # ID узлов не попадают в метки, иначе рядов будет по числу узлов.
+        endpoint = ID_PATTERN.sub('/{id}', request.url.path)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            BACKEND_ERRORS.labels(
+                request.method, endpoint, type(e).__name__,
+            ).inc()
+            raise
+        finally:
+            BACKEND_SECONDS.labels(request.method, endpoint).observe(
+                time.perf_counter() - start,
+            )
+        if response.status_code >= 400:
+            BACKEND_ERRORS.labels(
+                request.method, endpoint, str(response.status_code),
+            ).inc()
+        return response
+
+    async def aclose(self) -> None:
+        """Закрывает нижележащий транспорт."""
+        await self._transport.aclose()
+
+
+class InstrumentedRequest(BaseRequest):
+    """Запросы к Bot API с замером времени и подсчётом ответов 429."""
+
+    def __init__(self, request: BaseRequest) -> None:
+        """Оборачивает запросы, выполняющие сами вызовы."""
+        self._request = request
+
+    @property
+    def read_timeout(self) -> float | None:
+        """Возвращает таймаут чтения обёрнутых запросов."""
+        return self._request.read_timeout
+
+    async def initialize(self) -> None:
+        """Инициализирует обёрнутые запросы."""
+        await self._request.initialize()
+
+    async def shutdown(self) -> None:
+        """Закрывает обёрнутые запросы."""
+        await self._request.shutdown()
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, bytes]:
+        """Вызывает метод Bot API и учитывает его время."""
+        endpoint = url.rsplit('/', 1)[-1]
+        with TELEGRAM_SECONDS.labels(endpoint).time():
+            code, payload = await self._request.do_request(
+                url, method, request_data, **kwargs,
+            )
+        if code == httpx.codes.TOO_MANY_REQUESTS:
+            TELEGRAM_FLOOD.labels(endpoint).inc()
+        return code, payload
+
+
+class BotCollector(Collector):
+    """Снимает при каждом опросе счётчики компонентов и сессии бота.
+
+    sources — функции stats() компонентов: числовые значения становятся
+    метриками bot_<источник>_<ключ>, строковые — метками state.
+    Сервер метрик опрашивает сборщик из своего потока, а компоненты
+    меняют свои словари в цикле событий, поэтому снимок берётся в цикле.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        sources: dict[str, Callable[[], dict[str, Any]]],
+    ) -> None:
+        """Инициализирует сборщик в работающем цикле событий."""
+        self.application = application
+        self.sources = sources
+        self.loop = asyncio.get_running_loop()
+
+    def describe(self) -> list:
+        """Не описывает метрики заранее, чтобы регистрация не ждала цикл."""
+        return []
+
+    def _snapshot(self) -> tuple[dict[str, dict[str, Any]], list[int]]:
+        """Возвращает счётчики источников и глубины стеков сессий."""
+        return (
+            {source: stats() for source, stats in self.sources.items()},
+            [
+                len(data.get('stack', ()))
+                for data in self.application.user_data.values()
+            ],
+        )
+
+    def _snapshot_from_loop(
+        self,
+    ) -> tuple[dict[str, dict[str, Any]], list[int]]:
+        """Берёт снимок в цикле событий и ждёт его в потоке сервера."""
+        future: Future = Future()
+
+        def take() -> None:
+            try:
+                future.set_result(self._snapshot())
+            except Exception as e:
+                future.set_exception(e)
+
+        self.loop.call_soon_threadsafe(take)
+        return future.result(METRICS_SNAPSHOT_TIMEOUT)
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Возвращает текущие значения метрик."""
+        sources, depths = self._snapshot_from_loop()
+        for source, stats in sources.items():
+            for key, value in stats.items():
+                name = f'bot_{source}_{key}'
+                if isinstance(value, str):
+                    metric = GaugeMetricFamily(name, key, labels=['state'])
+                    metric.add_metric([value], 1)
+                else:
+                    metric = GaugeMetricFamily(name, key, value=value)
+                yield metric
+        yield GaugeMetricFamily(
+            'bot_sessions', 'Сессии пользователей в памяти',
+            value=len(depths),
+        )
+        metric = GaugeHistogramMetricFamily(
+            'bot_session_stack_depth', 'Глубина стека узлов в сессиях',
+        )
+        # Корзины накопительные, как у обычной гистограммы.
+        metric.add_metric(
+            [],
+            [
+                (
+                    '+Inf' if bound == float('inf') else str(bound),
+                    sum(depth <= bound for depth in depths),
+                )
+                for bound in STACK_BUCKETS
+            ],
+            gsum_value=sum(depths),
+        )
+        yield metric
+
+
+def start_metrics_server(
+    collector: BotCollector, host: str, port: int,
+) -> Callable[[], None]:
+    """Запускает HTTP-сервер метрик в отдельном потоке.
+
+    Возвращает функцию, которая останавливает сервер.
+    """
+    REGISTRY.register(collector)
+    server, thread = start_http_server(port, host)
+
+    def stop() -> None:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+        REGISTRY.unregister(collector)
+
+    return stop
@@ -0,0 +1,252 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from bot.constants import (
+    PRIORITY_INTERACTIVE,
+    SEND_CHATS_LIMIT,
+    SEND_CHAT_BURST,
+    SEND_GLOBAL_BURST,
+)
+
+Result = bool | dict[str, Any] | list[dict[str, Any]]
+
+
+class TokenBucket:
+    """Корзина токенов: rate запросов в секунду, не больше capacity подряд."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Инициализирует полную корзину."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+
+    def delay(self) -> float:
+        """Возвращает, сколько секунд ждать следующего токена."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self) -> None:
+        """Забирает один токен."""
+        self.tokens -= 1
+
+    def is_full(self) -> bool:
+        """Проверяет, что корзина полностью восстановилась."""
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class ChatLimit:
+    """Ограничение отправки в один чат."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Инициализирует свободный чат."""
+        self.bucket = TokenBucket(rate, capacity)
+        self.blocked_until = 0.0
+        self.waiting = 0
+
+    def delay(self) -> float:
+        """Возвращает, сколько секунд ждать права на отправку в чат."""
+        return max(
+            self.blocked_until - time.monotonic(), self.bucket.delay(),
+        )
+
+    def is_idle(self) -> bool:
+        """Проверяет, что состояние чата можно забыть."""
+        return (
+            not self.waiting and
+            self.blocked_until <= time.monotonic() and
+            self.bucket.is_full()
+        )
+
+
+class OutboundScheduler(BaseRateLimiter[dict[str, Any]]):
+    """Планировщик исходящих запросов к Bot API с учётом флуд-лимитов.
+
+    Запросы в чат сначала ждут лимит своего чата, затем общий лимит бота.
+    Общие токены выдаются по приоритету: ответы пользователям раньше
+    массовых рассылок (rate_limit_args={'priority': PRIORITY_BULK}).
+    RetryAfter блокирует только тот чат, для которого пришёл, остальные
+    чаты продолжают получать сообщения.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        private_rate: float,
+        group_rate: float,
+        max_retries: int,
+    ) -> None:
+        """Инициализирует планировщик, лимиты задаются в запросах/сек."""
+        self.global_bucket = TokenBucket(global_rate, SEND_GLOBAL_BURST)
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self._chats: dict[int | str, ChatLimit] = {}
+        # Очередь за общими токенами: (приоритет, номер, future).
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self.sent = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.retry_after_hits = 0
+
+    async def initialize(self) -> None:
+        """Запускает выдачу общих токенов."""
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def shutdown(self) -> None:
+        """Останавливает выдачу общих токенов."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._dispatcher
+            self._dispatcher = None
+
+    async def _dispatch(self) -> None:
+        """Выдаёт общие токены ожидающим в порядке приоритета."""
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            delay = self.global_bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                self.global_bucket.take()
+                waiter.set_result(None)
+
+    async def _acquire_global(self, priority: int) -> None:
+        """Ждёт общий токен с учётом приоритета."""
+        if not self._queue and self.global_bucket.delay() <= 0:
+            self.global_bucket.take()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+        self._wakeup.set()
+        try:
+            await waiter
+        finally:
+            waiter.cancel()
+
+    def _get_chat(self, chat_id: int | str) -> ChatLimit:
+        """Возвращает лимит чата, забывая давно простаивающие чаты."""
+        chat = self._chats.get(chat_id)
+        if chat is not None:
+            return chat
+        if len(self._chats) >= SEND_CHATS_LIMIT:
+            for key, other in list(self._chats.items()):
+                if other.is_idle():
+                    del self._chats[key]
+        # Отрицательные и строковые ID — группы и каналы.
+        is_group = isinstance(chat_id, str) or chat_id < 0
+        chat = ChatLimit(
+            self.group_rate if is_group else self.private_rate,
+            1 if is_group else SEND_CHAT_BURST,
+        )
+        self._chats[chat_id] = chat
+        return chat
+
+    async def _acquire_chat(self, chat: ChatLimit) -> None:
+        """Ждёт права на отправку в чат."""
+        chat.waiting += 1
+        try:
+            # Токен и блокировку перепроверяем после сна: их мог забрать
+            # параллельный запрос в тот же чат или продлить новый 429.
+            delay = chat.delay()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = chat.delay()
+            chat.bucket.take()
+        finally:
+            chat.waiting -= 1
+
+    async def _acquire(self, chat: ChatLimit | None, priority: int) -> None:
+        """Ждёт лимиты чата и бота, учитывая время ожидания."""
+        start = time.monotonic()
+        if chat is not None:
+            await self._acquire_chat(chat)
+            await self._acquire_global(priority)
+        waited = time.monotonic() - start
+        self.sent += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Result]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: dict[str, Any] | None,
+    ) -> Result:
+        """Отправляет запрос, соблюдая лимиты и повторяя его после 429."""
+        rate_limit_args = rate_limit_args or {}
+        priority = rate_limit_args.get('priority', PRIORITY_INTERACTIVE)
+        max_retries = rate_limit_args.get('max_retries', self.max_retries)
+        # Лимиты Telegram считаются по чатам, запросы без чата не ждём.
+        chat_id = data.get('chat_id')
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+        chat = self._get_chat(chat_id) if chat_id is not None else None
+        attempt = 0
+        while True:
+            await self._acquire(chat, priority)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                self.retry_after_hits += 1
+                if attempt >= max_retries:
+                    raise
+                attempt += 1
+                retry_after = e.retry_after
+                if not isinstance(retry_after, (int, float)):
+                    retry_after = retry_after.total_seconds()
+                logging.warning(
+                    f'Флуд-лимит {endpoint} для чата {chat_id}, '
+                    f'повтор через {retry_after} сек.',
+                )
+                if chat is None:
+                    await asyncio.sleep(retry_after)
+                else:
+                    chat.blocked_until = max(
+                        chat.blocked_until, time.monotonic() + retry_after,
+                    )
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает глубину очередей и время ожидания отправки."""
+        now = time.monotonic()
+        return {
+            'queued_global': len(self._queue),
+            'queued_chats': sum(chat.waiting for chat in self._chats.values()),
+            'blocked_chats': sum(
+                chat.blocked_until > now for chat in self._chats.values()
+            ),
+            'chats': len(self._chats),
+            'sent': self.sent,
+            'wait_avg': self.wait_total / self.sent if self.sent else 0.0,
+            'wait_max': self.wait_max,
+            'retry_after_hits': self.retry_after_hits,
+        }
@@ -1,15 +1,77 @@
 import logging
+from typing import Any, NamedTuple
 
-from telegram import InlineKeyboardMarkup, InputMediaPhoto, Update
+from telegram import InlineKeyboardMarkup, InputMediaPhoto, Message, Update
+from telegram.error import BadRequest
 
-from bot.constants import LAYOUT_GALLERY, LAYOUT_TEXT, LAYOUT_TEXT_IMAGE
+from bot.cache import LRUCache
+from bot.config import get_settings
+from bot.constants import (
+    LAST_MESSAGE_KEY,
+    LAYOUT_GALLERY,
+    LAYOUT_TEXT,
+    LAYOUT_TEXT_IMAGE,
+)
+from bot.keyboards import make_inline_kb
+from bot.media import is_not_modified, send_photos
+
+settings = get_settings()
+
+
+class RenderedNode(NamedTuple):
+    """Готовые текст и клавиатура узла."""
+
+    node: dict[str, Any]
+    text: str
+    kb: InlineKeyboardMarkup
+
+
+# Ключ — (ID узла, is_admin, include_back). Отдельной версии у узла нет,
+# поэтому запись годится, пока ответ бэкенда не изменился: сперва быстрая
+# проверка того же словаря, затем сравнение содержимого — корень из /start
+# и «Домой» каждый раз приходит новым словарём с тем же содержимым.
+_rendered: LRUCache[RenderedNode] = LRUCache(
+    settings.RENDER_CACHE_SIZE, float('inf'),
+)
+
+
+def prepare_node(
+    node: dict[str, Any], *, include_back: bool, is_admin: bool,
+) -> RenderedNode:
+    """Возвращает текст и клавиатуру узла, собирая их один раз."""
+    key = (node['id'], is_admin, include_back)
+    rendered = _rendered.get(key)
+    if rendered is not None and (
+        rendered.node is node or rendered.node == node
+    ):
+        return rendered
+    title = str(node.get('title') or '')
+    text = str(node.get('text') or '')
+    rendered = RenderedNode(
+        node=node,
+        text=f'<b>{title}</b>\n{text}' if title else text,
+        kb=make_inline_kb(
+            node_buttons=node['buttons'],
+            include_back=include_back,
+            is_admin=is_admin,
+            current_node_title=node['title'],
+        ),
+    )
+    _rendered.put(key, rendered)
+    return rendered
+
+
+def _valid_image(image: dict) -> bool:
+    """Проверяет, что у изображения есть пригодный URL."""
+    image_url = image.get('image_url')
+    return bool(image_url and image_url.startswith('http'))
 
 
 async def render_text(
         update: Update, kb: InlineKeyboardMarkup, full_content: str,
-) -> None:
+) -> Message:
     """Обработка текста."""
-    await update.effective_chat.send_message(
+    return await update.effective_chat.send_message(
         full_content, reply_markup=kb, parse_mode='HTML',
     )
 
@@ -19,84 +81,142 @@ async def render_text_image(
     kb: InlineKeyboardMarkup,
     full_content: str,
     images: list,
-) -> None:
+) -> Message:
     """Обработка текста с картинкой."""
     if images:
-        image_url = images[0].get('image_url')
-        if image_url and image_url.startswith('http'):
-            await update.effective_chat.send_photo(
-                photo=image_url,
-                caption=full_content,
-                reply_markup=kb,
-                parse_mode='HTML',
+        image = images[0]
+        if _valid_image(image):
+            return await send_photos(
+                [image],
+                lambda source: update.effective_chat.send_photo(
+                    photo=source(image),
+                    caption=full_content,
+                    reply_markup=kb,
+                    parse_mode='HTML',
+                ),
             )
-            return
-        logging.warning(f'TEXT_IMAGE: битый или пустой url: {image_url}')
-    await render_text(update, kb, full_content)
+        logging.warning(
+            f'TEXT_IMAGE: битый или пустой url: {image.get("image_url")}',
+        )
+    return await render_text(update, kb, full_content)
 
 
 async def render_gallery(
     update: Update, kb: InlineKeyboardMarkup, images: list, message_title: str,
-) -> None:
+) -> Message | None:
     """Обработка галереи."""
-    media = []
+    valid = []
     for img in images[:10]:
-        image_url = img.get('image_url')
-        if image_url and image_url.startswith('http'):
-            media.append(InputMediaPhoto(image_url))
+        if _valid_image(img):
+            valid.append(img)
         else:
-            logging.warning(f'Галерея: битый или пустой url: {image_url}')
-    if media:
-        await update.effective_chat.send_media_group(media)
+            logging.warning(
+                f'Галерея: битый или пустой url: {img.get("image_url")}',
+            )
+    if valid:
+        await send_photos(
+            valid,
+            lambda source: update.effective_chat.send_media_group(
+                [InputMediaPhoto(source(img)) for img in valid],
+            ),
+        )
         gallery_caption = f'<b>{message_title}</b>' if message_title else ''
         if gallery_caption:
-            await update.effective_chat.send_message(
+            return await update.effective_chat.send_message(
                 gallery_caption,
                 reply_markup=kb,
                 parse_mode='HTML',
             )
-    else:
-        await update.effective_chat.send_message(
-            'В галерее нет доступных изображений.',
-            reply_markup=kb,
-            parse_mode="HTML",
-        )
+        return None
+    return await update.effective_chat.send_message(
+        'В галерее нет доступных изображений.',
+        reply_markup=kb,
+        parse_mode="HTML",
+    )
+
+
+async def edit_in_place(
+    update: Update,
+    node: dict,
+    kb: InlineKeyboardMarkup,
+    full_content: str,
+    chat_data: dict | None,
+) -> bool:
+    """Перерисовывает сообщение, по кнопке которого пришёл колбэк.
+
+    Текст правится в текст, фото с подписью — в другое фото с подписью
+    одним вызовом edit_message_media. Сообщение меняется, только если оно
+    последнее из отправленных ботом в чат, иначе результат оказался бы
+    выше по истории. Галерея всегда отправляется заново: у группы
+    медиа не бывает клавиатуры.
+    """
+    query = update.callback_query
+    if not query or not query.message:
+        return False
+    message = query.message
+    last_message_id = (chat_data or {}).get(LAST_MESSAGE_KEY)
+    if last_message_id is not None and message.message_id != last_message_id:
+        return False
+    layout = node['layout_type']
+    images = node.get('images', [])
+    try:
+        if layout == LAYOUT_TEXT and not message.photo:
+            await message.edit_text(
+                full_content, reply_markup=kb, parse_mode='HTML',
+            )
+        elif (
+            layout == LAYOUT_TEXT_IMAGE and message.photo and
+            images and _valid_image(images[0])
+        ):
+            image = images[0]
+            await send_photos(
+                [image],
+                lambda source: message.edit_media(
+                    InputMediaPhoto(
+                        source(image),
+                        caption=full_content,
+                        parse_mode='HTML',
+                    ),
+                    reply_markup=kb,
+                ),
+            )
+        else:
+            return False
+    except BadRequest as e:
+        if is_not_modified(e):
+            return True
+        logging.warning(f'Не удалось изменить сообщение: {e}')
+        return False
+    return True
 
 
 async def render_node(
         update: Update,
-        node: dict,
-        kb: InlineKeyboardMarkup) -> None:
+        rendered: RenderedNode,
+        chat_data: dict | None = None) -> None:
     """Отображает узел диалога в соответствии с его типом."""
+    node, full_content, kb = rendered
     lt = node['layout_type']
-    message_text = str(node.get('text') or '')
     message_title = str(node.get('title') or '')
-    full_content = (
-        f'<b>{message_title}</b>\n{message_text}'
-        if message_title else message_text
-    )
 
-    if update.callback_query:
-        message_to_edit = update.callback_query.message
-        if lt == LAYOUT_TEXT and not getattr(message_to_edit, 'photo', None):
-            await message_to_edit.edit_text(
-                full_content,
-                reply_markup=kb,
-                parse_mode='HTML',
-            )
-            return
+    if await edit_in_place(update, node, kb, full_content, chat_data):
+        return
 
     if lt == LAYOUT_TEXT:
-        await render_text(update, kb, full_content)
+        message = await render_text(update, kb, full_content)
     elif lt == LAYOUT_TEXT_IMAGE:
-        await render_text_image(
+        message = await render_text_image(
             update, kb, full_content, node.get('images', []),
         )
     elif lt == LAYOUT_GALLERY:
-        await render_gallery(update, kb, node.get('images', []), message_title)
+        message = await render_gallery(
+            update, kb, node.get('images', []), message_title,
+        )
     else:
-        await update.effective_chat.send_message(
+        message = await update.effective_chat.send_message(
             'Неизвестный формат узла.',
             reply_markup=kb,
             parse_mode='HTML',
         )
+    if chat_data is not None and message is not None:
+        chat_data[LAST_MESSAGE_KEY] = message.message_id
@@ -0,0 +1,81 @@
+"""Benchmark of per-click backend latency: HTTP vs in-process ASGI.
+
+Starts the backend under uvicorn on a local port in this process and
+times the request a click makes on a node cache miss
+(GET /api/v1/nodes/{id}?depth=PREFETCH_DEPTH) through BackendClient in
+the default HTTP mode and in the co-located mode (BackendClient.use_app).
+Both modes hit the same backend with its node cache warm, so the
+difference is the cost of the TCP hop, HTTP parsing and uvicorn.
+
+Needs a configured database. Run from the repository root:
+PYTHONPATH=src python -m bot.scripts.bench_colocated
+"""
+import asyncio
+import statistics
+import time
+
+import uvicorn
+
+from bot.backend_client import BackendClient
+from bot.config import get_settings
+
+from src.app.main import app
+
+PORT = 8765
+ROUNDS = 500
+
+settings = get_settings()
+
+
+async def measure(client: BackendClient, node_ids: list[int]) -> list[float]:
+    """Return per-click latencies in milliseconds."""
+    latencies = []
+    for i in range(ROUNDS):
+        node_id = node_ids[i % len(node_ids)]
+        start = time.perf_counter()
+        await client._get_conditional(
+            f'/api/v1/nodes/{node_id}?depth={settings.PREFETCH_DEPTH}', None,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """Print latency percentiles."""
+    latencies.sort()
+    print(
+        f'{name:>5}: mean {statistics.fmean(latencies):6.2f} ms, '
+        f'p50 {latencies[len(latencies) // 2]:6.2f} ms, '
+        f'p95 {latencies[int(len(latencies) * 0.95)]:6.2f} ms',
+    )
+
+
+async def main() -> None:
+    """Run the backend and compare both client modes."""
+    server = uvicorn.Server(
+        uvicorn.Config(app, host='127.0.0.1', port=PORT, log_level='error'),
+    )
+    server_task = asyncio.create_task(server.serve())
+    for _ in range(100):
+        if server.started:
+            break
+        await asyncio.sleep(0.1)
+
+    http = BackendClient(f'http://127.0.0.1:{PORT}')
+    asgi = BackendClient(f'http://127.0.0.1:{PORT}')
+    asgi.use_app(app)
+    try:
+        graph = await http.get_graph()
+        node_ids = [node['id'] for node in graph['nodes']]
+        for name, client in (('http', http), ('asgi', asgi)):
+            await measure(client, node_ids)
+            report(name, await measure(client, node_ids))
+    finally:
+        await http.close()
+        await asgi.close()
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
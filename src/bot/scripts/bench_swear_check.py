@@ -0,0 +1,100 @@
+"""Benchmark of the HR message swear check under concurrent submissions.
+
+Compares the old inline check (predict + predict_proba on the event loop)
+with SwearChecker (one predict_proba in a process pool plus a result
+cache). For each mode USERS coroutines submit their texts at once while
+a probe coroutine measures how long the event loop stays blocked, i.e.
+how late other users' updates would be handled.
+
+Run from src: python -m bot.scripts.bench_swear_check
+"""
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from check_swear import SwearingCheck
+
+from bot.config import get_settings
+from bot.constants import SWEAR_PROBA
+from bot.swear import SwearChecker
+
+USERS = 50
+# Доля пользователей, повторяющих уже отправленный кем-то текст.
+REPEATS = 0.3
+WORKERS = 2
+PROBE_INTERVAL = 0.01
+
+settings = get_settings()
+
+
+def build_texts() -> list[str]:
+    """Build HR-like messages, some of them repeated."""
+    unique = int(USERS * (1 - REPEATS))
+    return [
+        f'подскажите пожалуйста как оформить отпуск номер {i % unique} '
+        'и какие документы нужно принести в отдел кадров'
+        for i in range(USERS)
+    ]
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Return percentile of values in milliseconds."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))] * 1000
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    """Measure event loop lag, i.e. delay of other users' updates."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run(name: str, check: Callable[[str], Awaitable[bool]]) -> None:
+    """Submit all texts at once and print latency and loop lag."""
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def submit(text: str) -> None:
+        start = time.perf_counter()
+        await check(text)
+        latencies.append(time.perf_counter() - start)
+
+    probe_task = asyncio.create_task(probe(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(submit(text) for text in build_texts()))
+    total = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    print(
+        f'{name:>7}: total {total * 1000:7.0f} ms, '
+        f'p50 {percentile(latencies, 0.5):7.0f} ms, '
+        f'p95 {percentile(latencies, 0.95):7.0f} ms, '
+        f'max loop lag {max(lags, default=0) * 1000:7.0f} ms',
+    )
+
+
+async def main() -> None:
+    """Run both modes with models loaded in advance."""
+    sch = SwearingCheck(stop_words=settings.STOP_WORDS)
+    sch.predict_proba('прогрев')
+
+    async def inline(text: str) -> bool:
+        return (
+            sch.predict(text)[0] == 1 or
+            sch.predict_proba(text)[0] >= SWEAR_PROBA
+        )
+
+    checker = SwearChecker(settings.STOP_WORDS, WORKERS, USERS)
+    await asyncio.gather(*map(asyncio.wrap_future, checker.start()))
+    try:
+        await run('inline', inline)
+        await run('pool', checker.is_swearing)
+    finally:
+        checker.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
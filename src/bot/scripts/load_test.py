@@ -0,0 +1,417 @@
+"""Offline load test of the bot handlers.
+
+Simulates USERS users at once: each sends /start, clicks CLICKS buttons
+of the keyboards the bot replied with, and sends one search message.
+Updates go through the application's update processor exactly as in
+production. The Bot API is replaced by an in-process fake that answers
+every call instantly or after --telegram-latency. The backend is a stub
+with a synthetic content tree, or the real app over the in-process ASGI
+transport (--backend app, needs a configured database).
+
+Reports p50/p95/p99 handler latency per update kind, Telegram API calls
+and backend requests per update.
+
+Flood limits and other bot settings are read from the environment as
+usual; the defaults below only make the run work offline. To measure with
+Telegram's real limits, export SEND_GLOBAL_RATE=30 SEND_PRIVATE_RATE=1.
+
+Run from src: python -m bot.scripts.load_test --users 1000
+(with --backend app: PYTHONPATH=src python -m bot.scripts.load_test ...
+from the repository root)
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any
+
+os.environ.setdefault('BOT_TOKEN', '123456:load-test')
+os.environ.setdefault('BACKEND_URL', 'http://backend.test/')
+os.environ.setdefault('STOP_WORDS', '[]')
+os.environ.setdefault('WATCH_CHANGES', 'False')
+os.environ.setdefault('WATCH_REVOCATIONS', 'False')
+os.environ.setdefault('CACHE_STATS_INTERVAL', '0')
+os.environ.setdefault('SEND_GLOBAL_RATE', '1000000')
+os.environ.setdefault('SEND_PRIVATE_RATE', '1000000')
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse, Response  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+from telegram import Update  # noqa: E402
+from telegram.ext import Application  # noqa: E402
+from telegram.request import BaseRequest, RequestData  # noqa: E402
+
+from bot.backend_client import backend  # noqa: E402
+from bot.main import build_application  # noqa: E402
+
+BOT_USER = {
+    'id': 123456, 'is_bot': True, 'first_name': 'Load test',
+    'username': 'load_test_bot',
+}
+NODES = 200
+BUTTONS = 5
+SEARCH_WORDS = ['отпуск', 'больничный', 'зарплата', 'пропуск', 'обучение']
+
+
+class FakeBotApi(BaseRequest):
+    """Bot API stand-in that answers every method the bot calls."""
+
+    def __init__(self, latency: float) -> None:
+        """Initialize with simulated network latency in seconds."""
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        # Последнее сообщение бота с клавиатурой в каждом чате.
+        self.last: dict[int, dict[str, Any]] = {}
+        self._message_ids = itertools.count(1)
+        self._file_ids = itertools.count(1)
+
+    @property
+    def read_timeout(self) -> float | None:
+        """Return default read timeout."""
+        return None
+
+    async def initialize(self) -> None:
+        """Do nothing."""
+
+    async def shutdown(self) -> None:
+        """Do nothing."""
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, bytes]:
+        """Answer Bot API method like Telegram does."""
+        endpoint = url.rsplit('/', 1)[-1]
+        params = request_data.parameters if request_data else {}
+        self.calls[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        result = self._result(endpoint, params)
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+    def _photo(self) -> list[dict[str, Any]]:
+        """Return photo sizes with a fresh file_id."""
+        file_id = f'file-{next(self._file_ids)}'
+        return [{
+            'file_id': file_id, 'file_unique_id': file_id,
+            'width': 800, 'height': 600,
+        }]
+
+    def _message(
+        self, params: dict[str, Any], message_id: int | None = None,
+        **fields: Any,
+    ) -> dict[str, Any]:
+        """Build message sent to the chat from params."""
+        chat_id = int(params['chat_id'])
+        message = {
+            'message_id': message_id or next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+            **fields,
+        }
+        markup = params.get('reply_markup')
+        if markup is not None:
+            message['reply_markup'] = (
+                json.loads(markup) if isinstance(markup, str) else markup
+            )
+            self.last[chat_id] = message
+        return message
+
+    def _result(self, endpoint: str, params: dict[str, Any]) -> Any:
+        """Return result of the Bot API method."""
+        if endpoint == 'getMe':
+            return BOT_USER
+        if endpoint == 'sendMessage':
+            return self._message(params, text=params['text'])
+        if endpoint == 'sendPhoto':
+            return self._message(
+                params, photo=self._photo(), caption=params.get('caption'),
+            )
+        if endpoint == 'sendMediaGroup':
+            return [
+                self._message(params, photo=self._photo())
+                for _ in params['media']
+            ]
+        if endpoint == 'editMessageText':
+            return self._message(
+                params, int(params['message_id']), text=params['text'],
+            )
+        if endpoint == 'editMessageMedia':
+            return self._message(
+                params, int(params['message_id']), photo=self._photo(),
+            )
+        return True
+
+
+def build_node(node_id: int) -> dict[str, Any]:
+    """Build node of the synthetic content tree."""
+    first_child = BUTTONS * (node_id - 1) + 2
+    children = range(first_child, min(first_child + BUTTONS, NODES + 1))
+    if node_id % 20 == 0:
+        layout, images = 'GALLERY', 3
+    elif node_id % 5 == 0:
+        layout, images = 'TEXT_IMAGE', 1
+    else:
+        layout, images = 'TEXT', 0
+    return {
+        'id': node_id,
+        'title': f'Раздел {node_id}',
+        'text': f'Текст раздела {node_id}. ' * 20,
+        'layout_type': layout,
+        'parent_id': (node_id - 2) // BUTTONS + 1 if node_id > 1 else None,
+        'children': [
+            {
+                'id': child, 'title': f'Раздел {child}', 'text': None,
+                'layout_type': 'TEXT', 'parent_id': node_id,
+            }
+            for child in children
+        ],
+        'buttons': [
+            {
+                'id': child, 'label': f'Раздел {child}',
+                'target_node_id': child, 'order': order,
+            }
+            for order, child in enumerate(children)
+        ],
+        'images': [
+            {
+                'id': node_id * 10 + i,
+                'image_url': f'http://backend.test/media/{node_id}_{i}.png',
+                'order': i,
+                'file_id': None,
+            }
+            for i in range(images)
+        ],
+    }
+
+
+def build_stub_backend() -> Starlette:
+    """Build stub backend serving the synthetic content tree."""
+    nodes = {node_id: build_node(node_id) for node_id in range(1, NODES + 1)}
+    auth = {'allowed': True, 'role': 'Пользователь'}
+
+    async def session(request: Request) -> Response:
+        return JSONResponse({**auth, 'root': nodes[1]})
+
+    async def telegram_auth(request: Request) -> Response:
+        return JSONResponse(auth)
+
+    async def graph(request: Request) -> Response:
+        return JSONResponse({'version': 1, 'nodes': list(nodes.values())})
+
+    async def graph_version(request: Request) -> Response:
+        return JSONResponse({'version': 1})
+
+    async def node(request: Request) -> Response:
+        node_id = request.path_params.get('node_id', 1)
+        etag = f'"{node_id}-1"'
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status_code=304)
+        return JSONResponse(
+            {**nodes[node_id], 'prefetched': []}, headers={'ETag': etag},
+        )
+
+    async def many(request: Request) -> Response:
+        ids = map(int, request.query_params.getlist('ids'))
+        return JSONResponse([nodes[i] for i in ids if i in nodes])
+
+    async def search(request: Request) -> Response:
+        return JSONResponse([
+            {'id': node_id, 'title': nodes[node_id]['title'], 'rank': 0.5}
+            for node_id in range(2, 2 + BUTTONS)
+        ])
+
+    async def file_ids(request: Request) -> Response:
+        return Response(status_code=204)
+
+    return Starlette(routes=[
+        Route('/api/v1/auth/telegram/session', session, methods=['POST']),
+        Route('/api/v1/auth/telegram', telegram_auth, methods=['POST']),
+        Route('/api/v1/nodes/graph/version', graph_version),
+        Route('/api/v1/nodes/graph', graph),
+        Route('/api/v1/nodes/search', search),
+        Route('/api/v1/nodes/root', node),
+        Route('/api/v1/nodes/{node_id:int}', node),
+        Route('/api/v1/nodes', many),
+        Route('/api/v1/images/file-ids', file_ids, methods=['PUT']),
+    ])
+
+
+class CountingApp:
+    """ASGI wrapper counting HTTP requests to the backend."""
+
+    def __init__(self, app: Any) -> None:
+        """Wrap ASGI app."""
+        self.app = app
+        self.requests = 0
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        """Count request and pass it to the wrapped app."""
+        if scope['type'] == 'http':
+            self.requests += 1
+        await self.app(scope, receive, send)
+
+
+class LoadTest:
+    """Simulated users driving the bot application."""
+
+    def __init__(
+        self, application: Application, api: FakeBotApi, think: float,
+    ) -> None:
+        """Initialize with application built on the fake Bot API."""
+        self.application = application
+        self.api = api
+        self.think = think
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self._update_ids = itertools.count(1)
+
+    def _user(self, user_id: int) -> dict[str, Any]:
+        return {'id': user_id, 'is_bot': False, 'first_name': f'U{user_id}'}
+
+    def _text_update(self, user_id: int, text: str) -> Update:
+        """Build update with user's text message."""
+        message = {
+            'message_id': next(self._update_ids),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            'text': text,
+        }
+        if text.startswith('/'):
+            message['entities'] = [
+                {'type': 'bot_command', 'offset': 0, 'length': len(text)},
+            ]
+        return Update.de_json(
+            {'update_id': next(self._update_ids), 'message': message},
+            self.application.bot,
+        )
+
+    def _click_update(
+        self, user_id: int, message: dict[str, Any], data: str,
+    ) -> Update:
+        """Build update with click on the button of bot's message."""
+        return Update.de_json(
+            {
+                'update_id': next(self._update_ids),
+                'callback_query': {
+                    'id': str(next(self._update_ids)),
+                    'from': self._user(user_id),
+                    'chat_instance': str(user_id),
+                    'message': message,
+                    'data': data,
+                },
+            },
+            self.application.bot,
+        )
+
+    async def _process(self, kind: str, update: Update) -> None:
+        """Process update through the update processor and time it."""
+        start = time.perf_counter()
+        await self.application.update_processor.process_update(
+            update, self.application.process_update(update),
+        )
+        self.latencies[kind].append(time.perf_counter() - start)
+
+    async def user(self, user_id: int, clicks: int) -> None:
+        """Simulate one user session."""
+        rng = random.Random(user_id)
+        await self._process('start', self._text_update(user_id, '/start'))
+        for _ in range(clicks):
+            await asyncio.sleep(rng.uniform(0, 2 * self.think))
+            message = self.api.last[user_id]
+            buttons = [
+                button['callback_data']
+                for row in message['reply_markup']['inline_keyboard']
+                for button in row if 'callback_data' in button
+            ]
+            nodes = [data for data in buttons if data.isdigit()]
+            data = rng.choice(nodes if nodes and rng.random() < 0.8
+                              else buttons)
+            await self._process(
+                'click', self._click_update(user_id, message, data),
+            )
+        await self._process(
+            'search', self._text_update(user_id, rng.choice(SEARCH_WORDS)),
+        )
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Return percentile of values in milliseconds."""
+    return values[min(len(values) - 1, int(len(values) * share))] * 1000
+
+
+def report(
+    test: LoadTest, backend_app: CountingApp, elapsed: float,
+) -> None:
+    """Print latency percentiles and calls per update."""
+    updates = sum(len(values) for values in test.latencies.values())
+    print(f'{updates} updates in {elapsed:.1f} s '
+          f'({updates / elapsed:.0f} updates/s)')
+    for kind, values in test.latencies.items():
+        values.sort()
+        print(
+            f'{kind:>7}: p50 {percentile(values, 0.5):7.1f} ms, '
+            f'p95 {percentile(values, 0.95):7.1f} ms, '
+            f'p99 {percentile(values, 0.99):7.1f} ms',
+        )
+    calls = test.api.calls.copy()
+    del calls['getMe']
+    print(f'Telegram calls per update: {calls.total() / updates:.2f}')
+    for endpoint, count in calls.most_common():
+        print(f'  {endpoint}: {count / updates:.2f}')
+    print(f'Backend requests per update: '
+          f'{backend_app.requests / updates:.2f}')
+    print(f'Backend client: {backend.transport_stats()}')
+    print(f'Outbound queue: {test.application.bot.rate_limiter.stats()}')
+    print(f'Update queue: {test.application.update_processor.stats()}')
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run the load test."""
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    if args.backend == 'app':
+        from src.app.main import app
+    else:
+        app = build_stub_backend()
+    backend_app = CountingApp(app)
+    backend.use_app(backend_app)
+    api = FakeBotApi(args.telegram_latency)
+    application = build_application(with_updater=False, request=api)
+    test = LoadTest(application, api, args.think)
+    async with application:
+        await application.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            test.user(user_id, args.clicks)
+            for user_id in range(1, args.users + 1)
+        ))
+        elapsed = time.perf_counter() - start
+        await application.stop()
+    report(test, backend_app, elapsed)
+    await backend.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--clicks', type=int, default=10)
+    parser.add_argument(
+        '--think', type=float, default=0.5,
+        help='mean pause between clicks of one user, s',
+    )
+    parser.add_argument(
+        '--telegram-latency', type=float, default=0.05,
+        help='simulated Bot API response time, s',
+    )
+    parser.add_argument('--backend', choices=['stub', 'app'], default='stub')
+    asyncio.run(main(parser.parse_args()))
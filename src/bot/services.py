@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Tuple
+from typing import Any, Tuple
 
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -7,8 +7,7 @@ from telegram.ext import ContextTypes
 from bot.backend_client import backend
 from bot.config import get_settings
 from bot.constants import ADMIN_PANEL_ROLES
-from bot.keyboards import make_inline_kb
-from bot.render import render_node
+from bot.render import prepare_node, render_node
 
 settings = get_settings()
 
@@ -21,6 +20,30 @@ async def check_user_allowed_and_role(user_id: int) -> Tuple[bool, bool]:
     return allowed, is_admin
 
 
+async def ensure_allowed(
+    update: Update, ctx: ContextTypes.DEFAULT_TYPE,
+) -> bool:
+    """Recheck user access and refresh role in session.
+
+    Права берутся из кеша клиента, который сбрасывает лента отзывов:
+    отключённый пользователь теряет доступ сразу, а не по сроку сессии.
+    """
+    allowed, is_admin = await check_user_allowed_and_role(
+        update.effective_user.id,
+    )
+    if allowed:
+        ctx.user_data['is_admin'] = is_admin
+        return True
+    ctx.user_data.pop('is_admin', None)
+    ctx.user_data.pop('waiting_for_hr_message', None)
+    message = update.message or (
+        update.callback_query and update.callback_query.message
+    )
+    if message:
+        await message.reply_text('Доступ запрещен. Обратись к HR.')
+    return False
+
+
 async def _initialize_session_and_goto_root(
     update: Update,
     ctx: ContextTypes.DEFAULT_TYPE,
@@ -28,7 +51,10 @@ async def _initialize_session_and_goto_root(
     """Initialize user session and go to root node."""
     ctx.user_data['stack'] = deque(maxlen=settings.STACK_LIMIT)
     user_id = update.effective_user.id
-    allowed, is_admin = await check_user_allowed_and_role(user_id)
+    # Права и корневой узел приходят одним запросом.
+    data = await backend.bootstrap_session(user_id)
+    allowed = data.get('allowed', False)
+    is_admin = data.get('role') in ADMIN_PANEL_ROLES
 
     if not allowed:
         msg = 'Доступ запрещен. Обратись к HR.'
@@ -39,30 +65,37 @@ async def _initialize_session_and_goto_root(
         return
 
     ctx.user_data['is_admin'] = is_admin
-    root_node = await backend.get_root_node()
-    await goto_node(update, ctx, node_id=root_node['id'])
+    root_node = data['root']
+    await goto_node(update, ctx, node_id=root_node['id'], node=root_node)
 
 
 async def goto_node(
     update: Update,
     ctx: ContextTypes.DEFAULT_TYPE, *,
     node_id: int,
+    node: dict[str, Any] | None = None,
 ) -> None:
-    """Get node and navigate."""
+    """Get node unless already loaded and navigate."""
     stack: deque = ctx.user_data.setdefault(
         'stack',
         deque(maxlen=settings.STACK_LIMIT),
     )
-    node = await backend.get_node(node_id)
+    if node is None:
+        node = await backend.get_node(node_id)
 
     if not stack or stack[-1] != node_id:
         stack.append(node_id)
 
-    kb = make_inline_kb(
-        node_buttons=node['buttons'],
+    rendered = prepare_node(
+        node,
         include_back=len(stack) > 1,
         is_admin=ctx.user_data.get('is_admin', False),
-        user_id=update.effective_user.id,
-        current_node_title=node['title'],
     )
-    await render_node(update, node, kb)
+    await render_node(update, rendered, ctx.chat_data)
+    # Прогреваем кнопки текущего экрана и историю одним запросом в фоне.
+    ctx.application.create_task(
+        backend.warm_nodes(
+            [btn['target_node_id'] for btn in node['buttons']] + list(stack),
+        ),
+        update=update,
+    )
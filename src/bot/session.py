@@ -0,0 +1,170 @@
+import json
+import logging
+from collections import deque
+from typing import Any
+
+from telegram import Update
+from telegram.ext import Application
+
+from bot.config import get_settings
+from bot.constants import LAST_MESSAGE_KEY
+
+settings = get_settings()
+
+# Короткие ключи полей сессии в хранилище. Поля вне списка живут только
+# в памяти реплики.
+USER_FIELDS = {
+    'stack': 's',
+    'hr_page': 'p',
+    'waiting_for_hr_message': 'w',
+    'is_admin': 'a',
+}
+CHAT_FIELDS = {LAST_MESSAGE_KEY: 'm'}
+
+
+def encode(data: dict[str, Any], fields: dict[str, str]) -> bytes:
+    """Кодирует известные поля сессии в компактный JSON."""
+    compact = {}
+    for name, key in fields.items():
+        value = data.get(name)
+        if value is None:
+            continue
+        compact[key] = list(value) if isinstance(value, deque) else value
+    return json.dumps(compact, separators=(',', ':')).encode()
+
+
+def decode(raw: bytes | None, fields: dict[str, str]) -> dict[str, Any]:
+    """Восстанавливает поля сессии из компактного JSON."""
+    compact = json.loads(raw) if raw else {}
+    data = {
+        name: compact[key] for name, key in fields.items() if key in compact
+    }
+    if 'stack' in data:
+        data['stack'] = deque(data['stack'], maxlen=settings.STACK_LIMIT)
+    return data
+
+
+class MemorySessionStore:
+    """Хранилище сессий в памяти процесса для тестов и отладки."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустое хранилище."""
+        self._items: dict[str, bytes] = {}
+
+    async def load(self, keys: list[str]) -> list[bytes | None] | None:
+        """Читает несколько ключей разом."""
+        return [self._items.get(key) for key in keys]
+
+    async def save(self, items: dict[str, bytes]) -> None:
+        """Записывает несколько ключей разом."""
+        self._items.update(items)
+
+    async def close(self) -> None:
+        """Ничего не делает."""
+
+
+class RedisSessionStore:
+    """Хранилище сессий в Redis или совместимом сервере.
+
+    Ключи живут ttl секунд с последнего обращения. Если сервер недоступен,
+    реплика продолжает работать с сессиями из своей памяти.
+    """
+
+    def __init__(self, url: str, ttl: int) -> None:
+        """Создаёт клиент, соединение открывается при первом запросе."""
+        from redis import asyncio as redis
+
+        self.ttl = ttl
+        self._client = redis.from_url(url)
+        self._error = redis.RedisError
+
+    async def load(self, keys: list[str]) -> list[bytes | None] | None:
+        """Читает несколько ключей одним пакетом, None при ошибке.
+
+        GETEX продлевает срок жизни: сессия, которую только читают, не
+        пропадает через ttl после последнего изменения.
+        """
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.getex(key, ex=self.ttl)
+                return await pipe.execute()
+        except self._error as e:
+            logging.warning(f'Не удалось прочитать сессию: {e}')
+            return None
+
+    async def save(self, items: dict[str, bytes]) -> None:
+        """Записывает несколько ключей одним пакетом команд."""
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, ex=self.ttl)
+                await pipe.execute()
+        except self._error as e:
+            logging.warning(f'Не удалось сохранить сессию: {e}')
+
+    async def close(self) -> None:
+        """Закрывает соединения с сервером."""
+        await self._client.aclose()
+
+
+SessionStore = MemorySessionStore | RedisSessionStore
+
+
+class SessionApplication(Application):
+    """Приложение, которое держит сессии пользователей во внешнем хранилище.
+
+    Перед обработкой обновления сессия пользователя и его чата читается
+    одним запросом в user_data и chat_data, после обработки изменённые
+    поля записываются одним запросом. Так любая реплика бота продолжает
+    диалог с того места, где его оставила другая.
+    """
+
+    def __init__(
+        self, *, session_store: SessionStore, **kwargs: Any,
+    ) -> None:
+        """Инициализирует приложение с хранилищем сессий."""
+        super().__init__(**kwargs)
+        self.session_store = session_store
+
+    async def process_update(self, update: object) -> None:
+        """Обрабатывает обновление, загрузив и сохранив сессию."""
+        if not isinstance(update, Update) or update.effective_user is None:
+            await super().process_update(update)
+            return
+        entries = [(
+            f'bot:user:{update.effective_user.id}',
+            self._user_data[update.effective_user.id],
+            USER_FIELDS,
+        )]
+        if update.effective_chat is not None:
+            entries.append((
+                f'bot:chat:{update.effective_chat.id}',
+                self._chat_data[update.effective_chat.id],
+                CHAT_FIELDS,
+            ))
+        keys = [key for key, _, _ in entries]
+        loaded = await self.session_store.load(keys)
+        if loaded is None:
+            # Хранилище недоступно — работаем с копией в памяти.
+            loaded = [encode(data, fields) for _, data, fields in entries]
+        else:
+            for (_, data, fields), raw in zip(entries, loaded):
+                for name in fields:
+                    data.pop(name, None)
+                data.update(decode(raw, fields))
+        try:
+            await super().process_update(update)
+        finally:
+            changed = {}
+            for (key, data, fields), raw in zip(entries, loaded):
+                encoded = encode(data, fields)
+                if encoded != (raw or b'{}'):
+                    changed[key] = encoded
+            if changed:
+                await self.session_store.save(changed)
+
+    async def shutdown(self) -> None:
+        """Останавливает приложение и закрывает хранилище."""
+        await super().shutdown()
+        await self.session_store.close()
@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from bot.cache import LRUCache
+from bot.config import get_settings
+from bot.constants import SWEAR_PROBA
+from bot.metrics import SWEAR_CHECK_SECONDS
+
+settings = get_settings()
+
+# Классификатор рабочего процесса, создаётся инициализатором пула.
+_checker: Any = None
+
+
+def _load_checker(stop_words: list[str]) -> None:
+    """Загружает модель в рабочем процессе."""
+    global _checker
+    from check_swear import SwearingCheck
+    from check_swear.swear_core import core
+
+    # Библиотека читает модель и векторизатор с диска при каждом вызове,
+    # в рабочем процессе достаточно прочитать их один раз.
+    core.vectorizer_load = functools.cache(core.vectorizer_load)
+    core.model_load = functools.cache(core.model_load)
+    _checker = SwearingCheck(stop_words=stop_words)
+
+
+def _swear_proba(text: str) -> float:
+    """Возвращает вероятность грубых выражений в тексте."""
+    return float(_checker.predict_proba(text)[0])
+
+
+class SwearChecker:
+    """Проверка текста на грубые выражения вне цикла событий.
+
+    Модель работает в отдельных процессах и не блокирует обработку
+    обновлений других пользователей. Процессы и модель поднимаются в фоне
+    при старте бота, а результаты для повторных текстов берутся из кеша.
+    """
+
+    def __init__(
+        self, stop_words: list[str], workers: int, cache_size: int,
+    ) -> None:
+        """Инициализирует проверку без запуска процессов."""
+        self.stop_words = stop_words
+        self.workers = workers
+        self._cache: LRUCache[float] = LRUCache(cache_size, float('inf'))
+        self._pool: ProcessPoolExecutor | None = None
+
+    def start(self) -> list[Future]:
+        """Запускает рабочие процессы и загрузку модели в них."""
+        if self._pool is not None:
+            return []
+        # spawn вместо fork: не копируем в рабочие процессы цикл событий
+        # и открытые соединения бота.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_load_checker,
+            initargs=(self.stop_words,),
+        )
+        # Пустые задачи заставляют пул поднять все процессы сразу.
+        return [
+            self._pool.submit(_swear_proba, '') for _ in range(self.workers)
+        ]
+
+    async def _compute(self, text: str) -> float:
+        """Считает вероятность в пуле, сбрасывая пул после его падения."""
+        self.start()
+        pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, _swear_proba, text,
+            )
+        except BrokenProcessPool:
+            # Упавший пул (например, модель не загрузилась) сам не
+            # восстанавливается: следующая проверка поднимет новый.
+            logging.exception('Пул проверки грубых выражений упал')
+            if self._pool is pool:
+                self.close()
+            raise
+
+    async def proba(self, text: str) -> float:
+        """Возвращает вероятность грубых выражений, считая её один раз."""
+        with SWEAR_CHECK_SECONDS.time():
+            return await self._cache.get_or_load(
+                text, lambda: self._compute(text),
+            )
+
+    async def is_swearing(self, text: str) -> bool:
+        """Проверяет, что текст вероятно содержит грубые выражения."""
+        # Прежние predict (порог 0.5) или predict_proba >= SWEAR_PROBA
+        # сводятся к одному сравнению, ведь SWEAR_PROBA меньше 0.5.
+        return await self.proba(text) >= SWEAR_PROBA
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает счётчики кеша проверок."""
+        return self._cache.stats()
+
+    def close(self) -> None:
+        """Останавливает рабочие процессы."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+swear_checker = SwearChecker(
+    settings.STOP_WORDS, settings.SWEAR_WORKERS, settings.SWEAR_CACHE_SIZE,
+)
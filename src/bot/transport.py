@@ -0,0 +1,216 @@
+import asyncio
+import random
+import time
+from typing import Any
+
+import httpx
+
+RETRY_METHODS = frozenset({'GET', 'HEAD'})
+RETRY_STATUSES = frozenset({502, 503, 504})
+# Расширение запроса httpx, которым помечены долгие опросы лент.
+LONG_POLL = 'long_poll'
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Бэкенд недоступен, запрос отклонён без обращения к нему."""
+
+
+class CircuitBreaker:
+    """Размыкатель цепи для запросов к бэкенду.
+
+    После threshold неудач подряд цепь размыкается, и запросы сразу
+    отклоняются. Через reset_timeout один пробный запрос проверяет бэкенд:
+    успех замыкает цепь, неудача снова размыкает её.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        """Инициализирует замкнутую цепь."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Возвращает состояние цепи: closed, open или half_open."""
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return 'open'
+        return 'half_open'
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли отправить запрос, и занимает пробный."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def success(self) -> None:
+        """Замыкает цепь после удачного запроса."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def failure(self) -> None:
+        """Учитывает неудачу и при необходимости размыкает цепь."""
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+    def release(self) -> None:
+        """Освобождает пробный запрос, который не дал результата."""
+        self._trial = False
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Транспорт httpx с ограничением параллельности, повторами и размыкателем.
+
+    Не больше max_concurrency запросов идут к бэкенду одновременно,
+    остальные ждут в очереди не дольше queue_timeout и получают
+    httpx.PoolTimeout. Идемпотентные GET повторяются при сетевых ошибках
+    и ответах 502–504 с экспоненциальной задержкой со случайным разбросом.
+    Истёкший таймаут чтения не повторяется: бэкенд уже получил запрос, а
+    повтор только утроил бы время ожидания пользователя.
+
+    Долгие опросы лент (расширение LONG_POLL) идут напрямую: висящие
+    десятки секунд запросы не должны занимать места в пределе
+    параллельности и пробный запрос размыкателя.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        *,
+        max_concurrency: int,
+        queue_timeout: float,
+        retries: int,
+        backoff: float,
+        breaker: CircuitBreaker,
+    ) -> None:
+        """Оборачивает транспорт, выполняющий сами запросы."""
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.retried = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def _acquire(self, request: httpx.Request) -> None:
+        """Ждёт места в пределах параллельности не дольше queue_timeout."""
+        start = time.monotonic()
+        self.queued += 1
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), self.queue_timeout,
+            )
+        except TimeoutError:
+            self.rejected += 1
+            raise httpx.PoolTimeout(
+                'Слишком много запросов к бэкенду', request=request,
+            ) from None
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - start
+        self.requests += 1
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    async def _send_once(self, request: httpx.Request) -> httpx.Response:
+        """Отправляет запрос, если цепь замкнута и есть свободное место."""
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError('Бэкенд недоступен', request=request)
+        try:
+            await self._acquire(request)
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.in_flight += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            # Нехватка соединений у нас — не признак сбоя бэкенда.
+            self.breaker.release()
+            raise
+        except httpx.TransportError:
+            self.failed += 1
+            self.breaker.failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+        if response.status_code >= 500:
+            self.failed += 1
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+        return response
+
+    async def handle_async_request(
+        self, request: httpx.Request,
+    ) -> httpx.Response:
+        """Отправляет запрос, повторяя идемпотентные при сбоях."""
+        if request.extensions.get(LONG_POLL):
+            return await self._transport.handle_async_request(request)
+        retries = self.retries if request.method in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._send_once(request)
+            except (CircuitOpenError, httpx.PoolTimeout, httpx.ReadTimeout):
+                # Отказы из-за перегрузки и медленные ответы не повторяем,
+                # чтобы не усиливать нагрузку.
+                raise
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES or
+                    attempt >= retries
+                ):
+                    return response
+                await response.aclose()
+            attempt += 1
+            self.retried += 1
+            # Полный разброс задержки, чтобы реплики не повторяли разом.
+            await asyncio.sleep(
+                random.uniform(0, self.backoff * 2 ** attempt),
+            )
+
+    async def aclose(self) -> None:
+        """Закрывает нижележащий транспорт."""
+        await self._transport.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает очередь, ожидание и состояние размыкателя."""
+        return {
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'requests': self.requests,
+            'queue_wait_avg': (
+                self.queue_wait_total / self.requests if self.requests else 0.0
+            ),
+            'queue_wait_max': self.queue_wait_max,
+            'retried': self.retried,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'breaker': self.breaker.state,
+        }
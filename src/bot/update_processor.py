@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections.abc import Awaitable
+from typing import Any
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from bot.metrics import UPDATE_WAIT_SECONDS
+
+# Ограничение базового класса берётся до ожидания очереди чата: частые
+# нажатия одного пользователя заняли бы все места. Поэтому базовому классу
+# передаём заведомо недостижимый предел, а свой проверяем после очереди.
+UNBOUNDED = 2 ** 31
+
+
+class ChatQueue:
+    """Очередь обновлений одного чата."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустую очередь."""
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class OrderedUpdateProcessor(BaseUpdateProcessor):
+    """Обработка обновлений по порядку внутри чата и параллельно между чатами.
+
+    Обновления одного чата выполняются строго друг за другом в порядке
+    поступления, поэтому два быстрых нажатия не меняют стек узлов и не
+    отрисовывают сообщения одновременно. Разные чаты обрабатываются
+    параллельно, но не больше max_concurrency обновлений сразу.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """Инициализирует обработчик с общим пределом параллельности."""
+        super().__init__(UNBOUNDED)
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._chats: dict[int, ChatQueue] = {}
+        self.active = 0
+        self.queued_global = 0
+        self.processed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def initialize(self) -> None:
+        """Ничего не делает."""
+
+    async def shutdown(self) -> None:
+        """Ничего не делает."""
+
+    @staticmethod
+    def _chat_id(update: object) -> int | None:
+        """Возвращает ID чата или пользователя, к которому относится."""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_chat is not None:
+            return update.effective_chat.id
+        if update.effective_user is not None:
+            return update.effective_user.id
+        return None
+
+    async def _run(self, coroutine: Awaitable[Any], start: float) -> None:
+        """Ждёт свободного места и обрабатывает обновление."""
+        chat_wait = time.monotonic() - start
+        self.queued_global += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued_global -= 1
+        now = time.monotonic()
+        UPDATE_WAIT_SECONDS.labels('chat').observe(chat_wait)
+        UPDATE_WAIT_SECONDS.labels('global').observe(now - start - chat_wait)
+        waited = now - start
+        self.processed += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.active += 1
+        try:
+            await coroutine
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any],
+    ) -> None:
+        """Обрабатывает обновление после предыдущих из того же чата."""
+        start = time.monotonic()
+        chat_id = self._chat_id(update)
+        if chat_id is None:
+            await self._run(coroutine, start)
+            return
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            chat = self._chats[chat_id] = ChatQueue()
+        chat.pending += 1
+        try:
+            # asyncio.Lock отдаёт блокировку в порядке ожидания.
+            async with chat.lock:
+                await self._run(coroutine, start)
+        finally:
+            chat.pending -= 1
+            if not chat.pending:
+                del self._chats[chat_id]
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает глубину очередей и время ожидания обработки."""
+        return {
+            'active': self.active,
+            'queued_global': self.queued_global,
+            'queued_chats': sum(
+                chat.pending - 1 for chat in self._chats.values()
+            ),
+            'chats': len(self._chats),
+            'processed': self.processed,
+            'wait_avg': (
+                self.wait_total / self.processed if self.processed else 0.0
+            ),
+            'wait_max': self.wait_max,
+        }
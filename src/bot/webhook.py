@@ -0,0 +1,100 @@
+import logging
+import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from telegram import Update
+from telegram.ext import Application
+
+from bot.config import get_settings
+
+settings = get_settings()
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+async def start_application(application: Application) -> None:
+    """Запускает бота внутри уже работающего цикла событий.
+
+    Без Updater бот получает обновления через вебхук, иначе сам опрашивает
+    getUpdates, как run_polling.
+    """
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    if application.updater is not None:
+        await application.updater.start_polling(drop_pending_updates=True)
+    elif settings.WEBHOOK_URL:
+        # Накопившиеся обновления не сбрасываем: их доставят после
+        # перезапуска в любую из реплик.
+        await application.bot.set_webhook(
+            url=settings.WEBHOOK_URL.rstrip('/') + settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+        )
+    await application.start()
+    logging.info('Bot started…')
+
+
+async def stop_application(application: Application) -> None:
+    """Останавливает бота, запущенного start_application."""
+    if application.updater is not None and application.updater.running:
+        await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    if application.post_shutdown:
+        await application.post_shutdown(application)
+
+
+def webhook_route(application: Application) -> Route:
+    """Создаёт маршрут, принимающий обновления от Telegram."""
+    if not settings.WEBHOOK_SECRET:
+        raise RuntimeError('Для режима webhook нужен WEBHOOK_SECRET')
+
+    async def receive_update(request: Request) -> Response:
+        """Проверяет секрет и ставит обновление в очередь."""
+        token = request.headers.get(SECRET_HEADER, '')
+        if not secrets.compare_digest(token, settings.WEBHOOK_SECRET):
+            return Response(status_code=403)
+        try:
+            update = Update.de_json(await request.json(), application.bot)
+        except ValueError:
+            return Response(status_code=400)
+        # Отвечаем сразу, не дожидаясь обработки: иначе Telegram сочтёт
+        # медленный ответ ошибкой и пришлёт обновление повторно.
+        await application.update_queue.put(update)
+        return Response()
+
+    return Route(settings.WEBHOOK_PATH, receive_update, methods=['POST'])
+
+
+def create_app(application: Application) -> Starlette:
+    """Создаёт ASGI-приложение, принимающее обновления через вебхук.
+
+    Каждая реплика бота поднимает такое приложение за общим URL: Telegram
+    шлёт обновление в любую из них, и оно попадает в очередь обработчиков
+    этой реплики так же, как при long polling.
+    """
+    route = webhook_route(application)
+
+    async def health(request: Request) -> Response:
+        """Отвечает балансировщику, что реплика жива."""
+        return Response()
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        """Запускает и останавливает бота вместе с сервером."""
+        await start_application(application)
+        try:
+            yield
+        finally:
+            await stop_application(application)
+
+    return Starlette(
+        routes=[route, Route('/health', health)],
+        lifespan=lifespan,
+    )
@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+import pytest
+
+from bot import backend_client
+from bot.backend_client import BackendClient
+from bot.constants import NODE_BATCH_SIZE
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_follow_survives_unexpected_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Feed watcher logs any error and keeps polling."""
+    monkeypatch.setattr(backend_client, 'CHANGES_RETRY_DELAY', 0)
+    errors = [KeyError('cursor'), ValueError('bad json'), httpx.ReadError('')]
+    cursors = []
+
+    async def poll(cursor: int | None) -> int:
+        cursors.append(cursor)
+        if errors:
+            raise errors.pop(0)
+        if len(cursors) > 4:
+            raise asyncio.CancelledError
+        return len(cursors)
+
+    client = BackendClient('http://backend')
+    with pytest.raises(asyncio.CancelledError):
+        await client._follow(poll, 'тест')
+    assert cursors == [None, None, None, None, 4]
+
+
+async def test_colocated_client_asks_for_uncompressed_bodies() -> None:
+    """In-process backend is not asked to gzip its responses."""
+    received = []
+
+    async def app(scope: dict, receive: object, send: object) -> None:
+        received.append(dict(scope['headers'])[b'accept-encoding'])
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': b'{"version":1}'})
+
+    client = BackendClient('http://backend')
+    client.use_app(app)
+    try:
+        assert await client.get_graph_version() == 1
+        with pytest.raises(RuntimeError):
+            client.use_app(app)
+    finally:
+        await client.close()
+    assert received == [b'identity']
+
+
+async def test_warm_nodes_stays_within_batch_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Long keyboard and history are fetched in several batches."""
+    monkeypatch.setattr(backend_client.settings, 'GRAPH_PRELOAD', False)
+    batches = []
+
+    async def get_nodes(node_ids: list[int]) -> list[dict]:
+        batches.append(node_ids)
+        return []
+
+    client = BackendClient('http://backend')
+    monkeypatch.setattr(client, 'get_nodes', get_nodes)
+    await client.warm_nodes(list(range(1, NODE_BATCH_SIZE + 31)))
+    assert [len(batch) for batch in batches] == [NODE_BATCH_SIZE, 30]
@@ -0,0 +1,112 @@
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot import callbacks, handlers, services
+
+pytestmark = pytest.mark.anyio
+
+
+def make_update(text: str | None = None, data: str | None = None) -> object:
+    """Build update with message text or callback data."""
+    message = SimpleNamespace(text=text, reply_text=AsyncMock())
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=42),
+        message=message if text is not None else None,
+        callback_query=SimpleNamespace(
+            data=data, answer=AsyncMock(), message=message,
+        ),
+    )
+
+
+async def test_denied_user_stays_unauthorized(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Denied user can neither search nor open nodes by buttons."""
+    check = AsyncMock(return_value=(False, False))
+    search = AsyncMock()
+    restart = AsyncMock()
+    goto = AsyncMock()
+    monkeypatch.setattr(services, 'check_user_allowed_and_role', check)
+    monkeypatch.setattr(handlers, 'handle_search', search)
+    monkeypatch.setattr(
+        callbacks, '_initialize_session_and_goto_root', restart,
+    )
+    monkeypatch.setattr(callbacks, 'goto_node', goto)
+    ctx = SimpleNamespace(user_data={})
+
+    for _ in range(2):
+        update = make_update(text='отпуск')
+        await handlers.handle_hr_message(update, ctx)
+        update.message.reply_text.assert_awaited_once_with(
+            'Доступ запрещен. Обратись к HR.',
+        )
+    assert check.await_count == 2
+    search.assert_not_awaited()
+    assert 'is_admin' not in ctx.user_data
+
+    ctx.user_data['stack'] = deque([1])
+    await callbacks.on_callback_query(make_update(data='7'), ctx)
+    restart.assert_awaited_once()
+    goto.assert_not_awaited()
+
+
+async def test_revoked_user_loses_access_in_open_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Authorized session does not outlive revoked access."""
+    check = AsyncMock(return_value=(True, False))
+    search = AsyncMock()
+    goto = AsyncMock()
+    monkeypatch.setattr(services, 'check_user_allowed_and_role', check)
+    monkeypatch.setattr(handlers, 'handle_search', search)
+    monkeypatch.setattr(callbacks, 'goto_node', goto)
+    ctx = SimpleNamespace(user_data={'stack': deque([1]), 'is_admin': False})
+
+    await handlers.handle_hr_message(make_update(text='отпуск'), ctx)
+    await callbacks.on_callback_query(make_update(data='7'), ctx)
+    assert search.await_count == 1
+    assert goto.await_count == 1
+
+    check.return_value = (False, False)
+    update = make_update(text='отпуск')
+    await handlers.handle_hr_message(update, ctx)
+    update.message.reply_text.assert_awaited_once_with(
+        'Доступ запрещен. Обратись к HR.',
+    )
+    ctx.user_data['is_admin'] = False
+    update = make_update(data='7')
+    await callbacks.on_callback_query(update, ctx)
+    update.callback_query.message.reply_text.assert_awaited_once_with(
+        'Доступ запрещен. Обратись к HR.',
+    )
+    assert search.await_count == 1
+    assert goto.await_count == 1
+    assert 'is_admin' not in ctx.user_data
+
+
+async def test_swear_check_failure_is_reported(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """User is told to retry when the message can not be checked."""
+    monkeypatch.setattr(
+        services, 'check_user_allowed_and_role',
+        AsyncMock(return_value=(True, False)),
+    )
+    monkeypatch.setattr(
+        handlers.swear_checker, 'is_swearing',
+        AsyncMock(side_effect=RuntimeError('pool is broken')),
+    )
+    send = AsyncMock()
+    monkeypatch.setattr(handlers.backend, 'send_hr_request', send)
+    ctx = SimpleNamespace(user_data={'waiting_for_hr_message': True})
+    update = make_update(text='Когда будет выплачена премия за прошлый месяц?')
+
+    await handlers.handle_hr_message(update, ctx)
+
+    update.message.reply_text.assert_awaited_once()
+    assert 'ещё раз' in update.message.reply_text.await_args.args[0]
+    send.assert_not_awaited()
+    assert ctx.user_data['waiting_for_hr_message']
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from bot.metrics import BotCollector
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_collector_reads_stats_in_event_loop() -> None:
+    """Scrape from the server thread takes stats on the loop thread."""
+    threads = []
+
+    def stats() -> dict[str, int]:
+        threads.append(threading.get_ident())
+        return {'active': 3}
+
+    application = SimpleNamespace(user_data={1: {'stack': [1, 2]}, 2: {}})
+    registry = CollectorRegistry(auto_describe=True)
+    registry.register(BotCollector(application, {'updates': stats}))
+
+    output = (await asyncio.to_thread(generate_latest, registry)).decode()
+
+    assert threads == [threading.get_ident()]
+    assert 'bot_updates_active 3.0' in output
+    assert 'bot_sessions 2.0' in output
+    assert 'bot_session_stack_depth_bucket{le="2"} 2.0' in output
@@ -0,0 +1,30 @@
+from bot.render import prepare_node
+
+
+def make_node(title: str) -> dict:
+    """Build node payload as the backend returns it."""
+    return {
+        'id': 1_000_001,
+        'title': title,
+        'text': 'Текст',
+        'layout_type': 'TEXT',
+        'buttons': [{'label': 'Раздел', 'target_node_id': 2, 'order': 0}],
+        'images': [],
+    }
+
+
+def test_same_content_in_new_dict_is_cached() -> None:
+    """Fresh root payload of /start reuses the rendered keyboard."""
+    first = prepare_node(
+        make_node('Главная'), include_back=False, is_admin=False,
+    )
+    second = prepare_node(
+        make_node('Главная'), include_back=False, is_admin=False,
+    )
+    assert second is first
+
+    changed = prepare_node(
+        make_node('Меню'), include_back=False, is_admin=False,
+    )
+    assert changed is not first
+    assert changed.text.startswith('<b>Меню</b>')
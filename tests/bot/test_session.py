@@ -0,0 +1,158 @@
+import json
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from telegram import Chat, Message, Update, User
+from telegram.ext import ApplicationBuilder, CallbackContext, TypeHandler
+from telegram.request import BaseRequest, RequestData
+
+from bot.constants import LAST_MESSAGE_KEY
+from bot.session import (
+    USER_FIELDS,
+    MemorySessionStore,
+    SessionApplication,
+    decode,
+    encode,
+)
+
+pytestmark = pytest.mark.anyio
+
+USER_KEY = 'bot:user:42'
+CHAT_KEY = 'bot:chat:42'
+
+
+class GetMeRequest(BaseRequest):
+    """Bot API stand-in answering getMe only."""
+
+    @property
+    def read_timeout(self) -> float | None:
+        """Return default read timeout."""
+        return None
+
+    async def initialize(self) -> None:
+        """Do nothing."""
+
+    async def shutdown(self) -> None:
+        """Do nothing."""
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, bytes]:
+        """Answer with the bot user."""
+        bot = {'id': 1, 'is_bot': True, 'first_name': 'Тест'}
+        return 200, json.dumps({'ok': True, 'result': bot}).encode()
+
+
+class RecordingStore(MemorySessionStore):
+    """Memory store that remembers every save."""
+
+    def __init__(self, available: bool = True) -> None:
+        """Initialize store, unavailable one fails every load."""
+        super().__init__()
+        self.available = available
+        self.saves: list[dict[str, bytes]] = []
+
+    async def load(self, keys: list[str]) -> list[bytes | None] | None:
+        """Read keys or report the store as unavailable."""
+        if not self.available:
+            return None
+        return await super().load(keys)
+
+    async def save(self, items: dict[str, bytes]) -> None:
+        """Record and store items."""
+        self.saves.append(dict(items))
+        await super().save(items)
+
+
+def make_update() -> Update:
+    """Build private message update from user 42."""
+    return Update(1, message=Message(
+        message_id=1,
+        date=datetime.now(timezone.utc),
+        chat=Chat(42, Chat.PRIVATE),
+        from_user=User(42, 'Тест', False),
+        text='отпуск',
+    ))
+
+
+async def process(
+    store: MemorySessionStore, handler: Any, updates: int = 1,
+) -> None:
+    """Run handler for updates in session application with store."""
+    application = (
+        ApplicationBuilder()
+        .token('123:test')
+        .request(GetMeRequest())
+        .get_updates_request(GetMeRequest())
+        .application_class(SessionApplication, {'session_store': store})
+        .build()
+    )
+    application.add_handler(TypeHandler(Update, handler))
+    async with application:
+        for _ in range(updates):
+            await application.process_update(make_update())
+
+
+def test_encode_decode_round_trip() -> None:
+    """Stack keeps its limit and empty fields are not stored."""
+    raw = encode(
+        {'stack': deque([1, 2]), 'hr_page': None, 'is_admin': False},
+        USER_FIELDS,
+    )
+    assert raw == b'{"s":[1,2],"a":false}'
+    data = decode(raw, USER_FIELDS)
+    assert data == {'stack': deque([1, 2]), 'is_admin': False}
+    assert data['stack'].maxlen is not None
+
+
+async def test_only_changed_key_is_saved_once() -> None:
+    """Update saves the changed user session in one call."""
+    store = RecordingStore()
+    await store.save({
+        USER_KEY: b'{"s":[1],"a":false}', CHAT_KEY: b'{"m":7}',
+    })
+    store.saves.clear()
+
+    async def handler(update: Update, ctx: CallbackContext) -> None:
+        assert list(ctx.user_data['stack']) == [1]
+        assert ctx.chat_data[LAST_MESSAGE_KEY] == 7
+        ctx.user_data['stack'].append(5)
+
+    await process(store, handler)
+
+    assert store.saves == [{USER_KEY: b'{"s":[1,5],"a":false}'}]
+
+
+async def test_unchanged_session_is_not_saved() -> None:
+    """Update that changes nothing writes nothing."""
+    store = RecordingStore()
+    await store.save({USER_KEY: b'{"a":false}'})
+    store.saves.clear()
+
+    async def handler(update: Update, ctx: CallbackContext) -> None:
+        ctx.user_data.get('stack')
+
+    await process(store, handler)
+
+    assert store.saves == []
+
+
+async def test_unavailable_store_keeps_memory_session() -> None:
+    """Without the store the replica goes on with its own copy."""
+    store = RecordingStore(available=False)
+    seen = []
+
+    async def handler(update: Update, ctx: CallbackContext) -> None:
+        seen.append(list(ctx.user_data.get('stack', ())))
+        ctx.user_data.setdefault('stack', deque()).append(len(seen))
+
+    await process(store, handler, updates=2)
+
+    assert seen == [[], [1]]
+    assert [list(save) for save in store.saves] == [[USER_KEY], [USER_KEY]]
@@ -0,0 +1,35 @@
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from bot.swear import SwearChecker
+
+pytestmark = pytest.mark.anyio
+
+
+class BrokenPool(Executor):
+    """Pool whose workers failed to start."""
+
+    def __init__(self) -> None:
+        """Initialize pool that was not shut down yet."""
+        self.closed = False
+
+    def submit(self, *args: object, **kwargs: object) -> Future:
+        """Fail like a pool with a dead worker."""
+        raise BrokenProcessPool('worker failed to load the model')
+
+    def shutdown(self, *args: object, **kwargs: object) -> None:
+        """Remember that the pool was shut down."""
+        self.closed = True
+
+
+async def test_broken_pool_is_dropped() -> None:
+    """Check after a pool crash fails once and leaves no broken pool."""
+    checker = SwearChecker([], workers=1, cache_size=10)
+    pool = checker._pool = BrokenPool()
+
+    with pytest.raises(BrokenProcessPool):
+        await checker.is_swearing('текст вопроса')
+    assert pool.closed
+    assert checker._pool is None
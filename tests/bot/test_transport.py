@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from bot.transport import LONG_POLL, CircuitBreaker, ResilientTransport
+
+pytestmark = pytest.mark.anyio
+
+
+class BlockingTransport(httpx.AsyncBaseTransport):
+    """Transport that holds long polls until released."""
+
+    def __init__(self) -> None:
+        """Initialize transport with long polls blocked."""
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def handle_async_request(
+        self, request: httpx.Request,
+    ) -> httpx.Response:
+        """Answer at once, long polls after release."""
+        self.calls += 1
+        if request.extensions.get(LONG_POLL):
+            await self.release.wait()
+        return httpx.Response(200, json={})
+
+
+def make_transport(
+    inner: httpx.AsyncBaseTransport, breaker: CircuitBreaker,
+) -> ResilientTransport:
+    """Wrap transport with one slot and no queueing."""
+    return ResilientTransport(
+        inner,
+        max_concurrency=1,
+        queue_timeout=0.05,
+        retries=2,
+        backoff=0,
+        breaker=breaker,
+    )
+
+
+async def test_long_poll_takes_no_slot_or_trial() -> None:
+    """Hanging feed poll leaves the slot and the breaker trial free."""
+    inner = BlockingTransport()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=1)
+    breaker.failure()
+    breaker.opened_at = time.monotonic() - 2
+    transport = make_transport(inner, breaker)
+
+    poll = asyncio.create_task(transport.handle_async_request(
+        httpx.Request(
+            'GET', 'http://backend/changes', extensions={LONG_POLL: True},
+        ),
+    ))
+    await asyncio.sleep(0)
+    try:
+        response = await transport.handle_async_request(
+            httpx.Request('GET', 'http://backend/nodes/1'),
+        )
+        assert response.status_code == 200
+        assert breaker.state == 'closed'
+    finally:
+        inner.release.set()
+    assert (await poll).status_code == 200
+
+
+async def test_read_timeout_is_not_retried() -> None:
+    """Slow backend is not asked again after a read timeout."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ReadTimeout('slow', request=request)
+
+    transport = make_transport(
+        httpx.MockTransport(handler), CircuitBreaker(5, 10),
+    )
+    with pytest.raises(httpx.ReadTimeout):
+        await transport.handle_async_request(
+            httpx.Request('GET', 'http://backend/nodes/1'),
+        )
+    assert len(calls) == 1
@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from src.app.core.db import engine
+from src.app.services.cache import node_cache
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run async tests on asyncio only."""
+    return 'asyncio'
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[AsyncSession]:
+    """Session whose changes are rolled back after the test.
+
+    Commits inside the code under test only release a savepoint.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        async with AsyncSession(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode='create_savepoint',
+        ) as session:
+            yield session
+        await transaction.rollback()
+    # Каждый тест идёт в своём цикле событий, соединения в нём не живут.
+    await engine.dispose()
+    node_cache.invalidate()
+
+
+class StatementCounter:
+    """Count SQL statements sent to the database."""
+
+    def __init__(self) -> None:
+        """Initialize counter with no statements."""
+        self.statements: list[str] = []
+
+    def __call__(self, *args: Any) -> None:
+        """Record statement from before_cursor_execute event."""
+        self.statements.append(args[2])
+
+    def reset(self) -> None:
+        """Forget recorded statements."""
+        self.statements.clear()
+
+    @property
+    def count(self) -> int:
+        """Return number of recorded statements."""
+        return len(self.statements)
+
+
+@pytest.fixture
+def statements() -> Iterator[StatementCounter]:
+    """Count statements executed during the test."""
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, 'before_cursor_execute', counter)
+    yield counter
+    event.remove(engine.sync_engine, 'before_cursor_execute', counter)
+
+
+@pytest.fixture
+def request_() -> Request:
+    """Request to the backend as the bot sends it."""
+    return Request({
+        'type': 'http',
+        'scheme': 'http',
+        'server': ('backend', 80),
+        'root_path': '',
+        'path': '/',
+        'query_string': b'',
+        'headers': [],
+    })
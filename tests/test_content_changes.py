@@ -0,0 +1,126 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.core.const import CONTENT_CHANGES_KEEP, CONTENT_CHANGES_PRUNED
+from src.app.core.db import async_session_maker, engine
+from src.app.crud.content_change import content_change_crud
+from src.app.models.content import ContentChange
+from src.app.models.release import ContentRelease
+from src.app.services.content_change import (
+    get_content_changes,
+    prune_content_changes,
+)
+from src.app.services.release import publish_release
+
+pytestmark = pytest.mark.anyio
+
+# Узлов с такими ID нет, записи теста не смешиваются с настоящими.
+FIRST, SECOND = 2_000_000_001, 2_000_000_002
+# Публикации попадают в ленту и при опубликованном релизе.
+PUBLISHED = {
+    'table_name': ContentRelease.__tablename__, 'operation': 'PUBLISH',
+}
+
+
+def change(node_id: int, **values: object) -> object:
+    """Build insert of change log entry for node."""
+    values = {
+        'table_name': 'node', 'operation': 'UPDATE', **values,
+    }
+    return insert(ContentChange).values(
+        row_id=node_id, node_id=node_id, **values,
+    )
+
+
+@pytest.fixture
+async def sessions() -> AsyncIterator[async_sessionmaker]:
+    """Sessions that commit, with test entries removed afterwards."""
+    yield async_session_maker
+    async with async_session_maker() as session:
+        await session.execute(delete(ContentChange).where(
+            ContentChange.node_id.in_([FIRST, SECOND]),
+        ))
+        await session.execute(delete(ContentChange).where(
+            ContentChange.node_id == CONTENT_CHANGES_PRUNED,
+            ContentChange.txid == 1,
+        ))
+        await session.commit()
+    await engine.dispose()
+
+
+async def test_change_committed_late_is_not_skipped(
+    sessions: async_sessionmaker,
+) -> None:
+    """Cursor does not pass a change whose transaction is still open."""
+    async with sessions() as session:
+        cursor = (await get_content_changes(None, 0, session)).cursor
+    async with sessions() as first, sessions() as second:
+        # Первая транзакция пишет раньше, а фиксируется позже второй.
+        await first.execute(change(FIRST, **PUBLISHED))
+        await second.execute(change(SECOND, **PUBLISHED))
+        await second.commit()
+        async with sessions() as session:
+            feed = await get_content_changes(cursor, 0, session)
+        delivered = [c.node_id for c in feed.changes]
+        await first.commit()
+    async with sessions() as session:
+        feed = await get_content_changes(feed.cursor, 0, session)
+    delivered += [c.node_id for c in feed.changes]
+    assert sorted(set(delivered) & {FIRST, SECOND}) == [FIRST, SECOND]
+
+
+async def test_pruned_cursor_gets_reset(session: AsyncSession) -> None:
+    """Cursor older than retained changes makes the feed reset."""
+    old = datetime.now() - CONTENT_CHANGES_KEEP - timedelta(days=1)
+    await session.execute(change(FIRST, changed_at=old, txid=1))
+    await content_change_crud.prune(keep=CONTENT_CHANGES_KEEP, session=session)
+    assert await content_change_crud.get_pruned_txid(session=session) >= 1
+    feed = await get_content_changes(1, 0, session)
+    assert feed.reset
+    assert feed.changes == []
+    assert feed.cursor > 1
+    assert CONTENT_CHANGES_PRUNED not in [c.node_id for c in feed.changes]
+
+
+async def test_old_changes_are_pruned_without_publish(
+    sessions: async_sessionmaker,
+) -> None:
+    """Background task removes expired changes between publications."""
+    old = datetime.now() - CONTENT_CHANGES_KEEP - timedelta(days=1)
+    async with sessions() as session:
+        await session.execute(change(FIRST, changed_at=old, txid=1))
+        await session.commit()
+
+    task = asyncio.create_task(prune_content_changes(3600))
+    try:
+        async with sessions() as session:
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                left = await session.scalar(
+                    select(ContentChange.id)
+                    .where(ContentChange.node_id == FIRST),
+                )
+                await session.rollback()
+                if left is None:
+                    break
+        assert left is None
+    finally:
+        task.cancel()
+
+
+async def test_draft_changes_are_hidden_after_publish(
+    session: AsyncSession,
+) -> None:
+    """Once a release is current the feed carries only publications."""
+    await publish_release(session)
+    since = await content_change_crud.get_horizon(session=session) - 1
+    await session.execute(change(FIRST, txid=since))
+    await session.execute(change(SECOND, txid=since, **PUBLISHED))
+
+    feed = await get_content_changes(since, 0, session)
+    assert [c.node_id for c in feed.changes] == [SECOND]
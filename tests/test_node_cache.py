@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+
+from src.app.services.cache import NodeCache
+from src.app.services.node import raise_node_not_found
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_build_leaves_no_lock() -> None:
+    """Lookups of missing nodes do not accumulate locks."""
+    cache = NodeCache()
+
+    async def build() -> bytes:
+        raise_node_not_found()
+
+    for node_id in range(3):
+        with pytest.raises(HTTPException):
+            await cache.get_or_build((node_id, 'http://backend/'), build)
+    assert cache.stats()['locks'] == 0
+    assert cache.stats()['size'] == 0
+
+
+def test_size_is_capped_by_least_recent_use() -> None:
+    """Entry read recently survives, the oldest unread one is evicted."""
+    cache = NodeCache(max_size=2)
+    cache.put('a', b'a', cache.version)
+    cache.put('b', b'b', cache.version)
+    assert cache.get('a') == b'a'
+    cache.put('c', b'c', cache.version)
+    assert cache.stats()['size'] == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == b'a'
+    assert cache.get('c') == b'c'
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from tests.conftest import StatementCounter
+
+from src.app.core.config import settings
+from src.app.crud.image import image_crud
+from src.app.crud.node import node_crud
+from src.app.models.content import Button, Image, Node
+from src.app.models.release import CurrentRelease
+from src.app.schemas.content import ImageFileId
+from src.app.services.cache import node_cache
+from src.app.services.node import get_node_json
+from src.app.services.release import publish_release
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_tree(session: AsyncSession) -> list[Node]:
+    """Create node with a child, a button to it and an image."""
+    parent = Node(title='Тест: раздел', text='Текст раздела')
+    session.add(parent)
+    await session.flush()
+    child = Node(title='Тест: подраздел', text='Текст', parent_id=parent.id)
+    session.add(child)
+    await session.flush()
+    session.add(Button(
+        source_node_id=parent.id,
+        target_node_id=child.id,
+        label='Подраздел',
+        order=0,
+    ))
+    await session.flush()
+    # FileType ждёт загружаемый файл, поэтому путь пишем напрямую.
+    await session.execute(
+        text(
+            'INSERT INTO image (node_id, image_url, file_name, "order") '
+            "VALUES (:node_id, 'photo.png', 'photo.png', 0)",
+        ),
+        {'node_id': parent.id},
+    )
+    return [parent, child]
+
+
+async def unpublish(session: AsyncSession) -> None:
+    """Serve live nodes as if nothing was published."""
+    await session.execute(delete(CurrentRelease))
+    await session.flush()
+    node_cache.invalidate()
+
+
+async def test_node_miss_is_one_statement(
+    session: AsyncSession, statements: StatementCounter, request_: Request,
+) -> None:
+    """Live node with relations is built by one statement."""
+    await unpublish(session)
+    parent, child = await create_tree(session)
+
+    statements.reset()
+    node = json.loads(await get_node_json(parent.id, session, request_))
+    # Первый промах после смены версии ещё читает ID текущего релиза.
+    assert statements.count == 2
+    assert [btn['target_node_id'] for btn in node['buttons']] == [child.id]
+    assert [c['id'] for c in node['children']] == [child.id]
+    assert node['images'][0]['image_url'] == 'http://backend/media/photo.png'
+
+    statements.reset()
+    await get_node_json(child.id, session, request_)
+    assert statements.count == 1
+
+    statements.reset()
+    await get_node_json(parent.id, session, request_)
+    assert statements.count == 0
+
+
+async def test_released_node_miss_is_one_statement(
+    session: AsyncSession, statements: StatementCounter, request_: Request,
+) -> None:
+    """Published node is read by one statement."""
+    parent, child = await create_tree(session)
+    await publish_release(session)
+    await get_node_json(parent.id, session, request_)
+
+    statements.reset()
+    node = json.loads(await get_node_json(child.id, session, request_))
+    assert statements.count == 1
+    assert node['title'] == 'Тест: подраздел'
+
+
+async def test_file_id_reaches_published_node(
+    session: AsyncSession, request_: Request,
+) -> None:
+    """Saved file_id is served from the current release without publish."""
+    parent, _ = await create_tree(session)
+    await publish_release(session)
+    image_id = await session.scalar(
+        select(Image.id).where(Image.node_id == parent.id),
+    )
+
+    await image_crud.set_file_ids(
+        items=[ImageFileId(image_id=image_id, file_id='AgAD-test')],
+        session=session,
+    )
+
+    node = json.loads(await get_node_json(parent.id, session, request_))
+    assert node['images'][0]['file_id'] == 'AgAD-test'
+
+
+async def test_host_header_does_not_split_cache(
+    session: AsyncSession,
+    request_: Request,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """With configured base URL any Host shares one cache entry."""
+    monkeypatch.setattr(settings, 'MEDIA_BASE_URL', 'https://media.test/')
+    parent, _ = await create_tree(session)
+    await publish_release(session)
+
+    for host in ('backend', 'evil-1.test', 'evil-2.test'):
+        request = Request({**request_.scope, 'server': (host, 80)})
+        node = json.loads(await get_node_json(parent.id, session, request))
+    assert node['images'][0]['image_url'] == (
+        'https://media.test/media/photo.png'
+    )
+    # Кроме узла в кеше лежит только ID текущего релиза.
+    assert node_cache.stats()['size'] == 2
+
+
+async def test_prefetch_stops_at_hidden_node(session: AsyncSession) -> None:
+    """Nodes behind a deactivated node are not prefetched."""
+    await unpublish(session)
+    start = Node(title='Тест: старт', text='')
+    hidden = Node(title='Тест: скрытый', text='', is_active=False)
+    behind = Node(title='Тест: за скрытым', text='')
+    session.add_all([start, hidden, behind])
+    await session.flush()
+    session.add_all([
+        Button(
+            source_node_id=start.id, target_node_id=hidden.id,
+            label='Скрытый', order=0,
+        ),
+        Button(
+            source_node_id=hidden.id, target_node_id=behind.id,
+            label='Дальше', order=0,
+        ),
+    ])
+    await session.flush()
+
+    rows = await node_crud.get_hydrated_subtree(
+        node_id=start.id, depth=2, session=session,
+    )
+    assert [row.Node.id for row in rows] == [start.id]
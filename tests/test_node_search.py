@@ -0,0 +1,37 @@
+import json
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.models.content import Node
+from src.app.services.node import search_nodes_json
+from src.app.services.release import publish_release
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_finds_published_title_only(
+    session: AsyncSession,
+) -> None:
+    """Unpublished title is not searchable until the next release."""
+    node = Node(title='Тест: командировка', text='Оформление поездки')
+    session.add(node)
+    await session.flush()
+    await publish_release(session)
+
+    await session.execute(
+        update(Node)
+        .where(Node.id == node.id)
+        .values(title='Тест: стажировка'),
+    )
+    await session.flush()
+
+    found = json.loads(await search_nodes_json('командировка', 5, session))
+    assert [item['id'] for item in found] == [node.id]
+    assert found[0]['title'] == 'Тест: командировка'
+    assert json.loads(await search_nodes_json('стажировка', 5, session)) == []
+
+    await publish_release(session)
+    found = json.loads(await search_nodes_json('стажировка', 5, session))
+    assert [item['id'] for item in found] == [node.id]